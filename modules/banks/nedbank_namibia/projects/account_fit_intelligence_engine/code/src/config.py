@@ -5,10 +5,62 @@ This module provides functions to load and validate YAML configuration files
 for account types, simulation parameters, and feature definitions.
 """
 
-import yaml
-from pathlib import Path
+import os
+import pickle
+from functools import lru_cache
 from typing import Dict, Any
 
+import yaml
+
+# Prefer the libyaml-backed C parser; fall back to the pure-Python SafeLoader
+# when PyYAML was built without libyaml. Both enforce safe_load semantics.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=64)
+def _parse_yaml(path: str, mtime_ns: int, size: int) -> bytes:
+    """
+    Parse a YAML file and return it as an in-memory pickle snapshot.
+
+    Cached on (path, mtime, size) so edits invalidate. Unpickling the
+    snapshot yields an independent copy several times faster than
+    copy.deepcopy of the parsed tree. The bytes never leave the process.
+    """
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=_YAML_LOADER)
+    return pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_yaml_config(path: str) -> Any:
+    """
+    Load any YAML configuration file through the shared parse cache.
+
+    Repeated loads of an unchanged file skip parsing entirely; the cache is
+    keyed on (path, mtime, size), so edits are picked up on the next call.
+    The cache-key stat doubles as the existence check, so a missing file
+    costs a single failed syscall.
+
+    Args:
+        path: Path to a YAML file
+
+    Returns:
+        Parsed YAML content (a private copy the caller may mutate)
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        yaml.YAMLError: If the file is invalid YAML
+
+    Example:
+        >>> schedule = load_yaml_config('configs/fee_schedules/nedbank_2026_27.yaml')
+    """
+    abs_path = os.path.abspath(path)
+    try:
+        st = os.stat(abs_path)
+        snapshot = _parse_yaml(abs_path, st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {path}") from None
+    return pickle.loads(snapshot)
+
 
 def load_account_config(path: str) -> Dict[str, Any]:
     """
@@ -29,13 +81,7 @@ def load_account_config(path: str) -> Dict[str, Any]:
         >>> print(config['account_type_id'])
         'silver_payu'
     """
-    config_path = Path(path)
-    
-    if not config_path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {path}")
-    
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config(path)
     
     return config
 
@@ -59,13 +105,7 @@ def load_simulation_config(config_path: str = 'configs/simulation.yaml') -> Dict
         >>> print(config['data_generation']['customers']['count'])
         100
     """
-    path = Path(config_path)
-    
-    if not path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
-    
-    with open(path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config(config_path)
     
     # TODO: Add configuration validation
     
@@ -91,13 +131,7 @@ def load_features_config(config_path: str = 'configs/features.yaml') -> Dict[str
         >>> print(config['frequency_features'][0]['name'])
         'txn_count_monthly'
     """
-    path = Path(config_path)
-    
-    if not path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
-    
-    with open(path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config(config_path)
     
     # TODO: Add configuration validation
     
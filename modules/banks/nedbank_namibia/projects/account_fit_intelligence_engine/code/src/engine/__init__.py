@@ -0,0 +1 @@
+"""Account fit orchestration, KPI engine and portfolio engine."""
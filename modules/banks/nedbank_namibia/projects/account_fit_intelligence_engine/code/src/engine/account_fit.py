@@ -36,24 +36,37 @@ Changes in v0.3.1:
 from pathlib import Path
 import sys
 import argparse
-import yaml
+import heapq
 import json
+from collections import Counter
+from operator import itemgetter
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Make code/src importable when run as a script. Skipped when already on the
+# path (e.g. `python -m engine.account_fit` from code/src, or a second import).
+_THIS_FILE = Path(__file__).resolve()
+_SRC_DIR = str(_THIS_FILE.parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
-from config import load_account_config
-from ingest.load_data import load_transactions
+from config import load_account_config, load_yaml_config
+from ingest.load_data import CUSTOMER_DTYPES, load_transactions, prefetch_file
 from fees.tariff_engine import (
     load_fee_schedule,
     compute_variable_fees,
     compute_cash_deposit_fee,
+    resolve_deposit_eligibility,
+)
+from features.build_features import (
+    extract_behavioural_features,
+    extract_behavioural_features_batch,
 )
-from features.build_features import extract_behavioural_features
 from utils.paths import find_project_root
 from engine.kpi_engine import KPIEngine   # v0.3.0
 
+import numpy as np
 import pandas as pd
 
 
@@ -93,32 +106,108 @@ def clamp59(s: str) -> str:
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Only the columns the engine reads, with explicit dtypes (no inference pass)
+_CUSTOMER_COLUMNS = ['customer_id', 'customer_segment', 'annual_turnover']
+
+# Column order of the single-mode results frame (one row per customer)
+_RESULT_COLUMNS = [
+    'customer_id', 'customer_segment', 'txn_count', 'digital_ratio',
+    'behaviour_tag', 'total_inflow', 'total_outflow', 'fixed_fee',
+    'variable_fee', 'total_fee', 'top_drivers', 'deposit_fee',
+    'deposit_eligibility', 'deposit_txn_count', 'show_deposit_line',
+    'kpi_results',  # v0.3.0: None for PAYU path
+    'features',     # v0.3.1: raw features for footer rollups
+]
+
+# Horizontal rules framing the single-mode report
+_REPORT_RULE = "=" * 70
+_REPORT_THIN_RULE = "-" * 70
+
+
 def load_customers(customers_path: str) -> pd.DataFrame:
     """Load customers CSV and return as DataFrame."""
-    return pd.read_csv(customers_path)
+    prefetch_file(customers_path)
+    return pd.read_csv(
+        customers_path,
+        usecols=_CUSTOMER_COLUMNS,
+        dtype=CUSTOMER_DTYPES,
+        engine='c',
+    )
+
+
+def resolve_customer_segment(segment) -> str:
+    """
+    Normalise a customer_segment value read from a customer row.
+
+    Every mode reads segments through this helper, so a customer with a
+    blank segment lands in the same deposit eligibility bucket whether the
+    run is single, compare or portfolio.
+
+    Args:
+        segment: Raw customer_segment value (str, None or NaN)
+
+    Returns:
+        'individual' when the segment is missing or blank, otherwise the
+        segment as a string
+
+    Example:
+        >>> resolve_customer_segment(float('nan'))
+        'individual'
+        >>> resolve_customer_segment('sme')
+        'sme'
+    """
+    if segment is None or (not isinstance(segment, str) and pd.isna(segment)):
+        return 'individual'
+    segment = str(segment)
+    return segment if segment.strip() else 'individual'
 
 
-def build_customer_map(customers_df: pd.DataFrame) -> dict:
+def build_customer_map(customers_df: pd.DataFrame, customer_ids) -> tuple:
     """
-    Build a fast-lookup dict: customer_id -> {segment, annual_turnover}.
+    Build customer profile arrays aligned to a given customer id order.
+
+    Position i of each returned array describes customer_ids[i], so callers
+    holding integer customer codes (e.g. from pd.factorize) index directly
+    instead of hashing id strings per customer.
 
     Args:
         customers_df: Customers DataFrame (must have customer_id, customer_segment,
                       and annual_turnover columns)
+        customer_ids: Sequence of customer ids to align to
 
     Returns:
-        Dict keyed on customer_id
+        Tuple of (segments, turnovers): object arrays of segment (missing,
+        blank or unknown customer -> 'individual', see
+        resolve_customer_segment) and annual turnover (missing or unknown
+        customer -> None)
+
+    Example:
+        >>> codes, ids = pd.factorize(transactions['customer_id'])
+        >>> segments, turnovers = build_customer_map(customers_df, ids)
+        >>> segments[codes[0]], turnovers[codes[0]]
     """
-    customer_map = {}
-    for _, row in customers_df.iterrows():
-        turnover_val = row.get('annual_turnover', None)
-        if pd.isna(turnover_val):
-            turnover_val = None
-        customer_map[row['customer_id']] = {
-            'customer_segment': str(row.get('customer_segment', 'individual')),
-            'annual_turnover': turnover_val,
-        }
-    return customer_map
+    # Last row wins on duplicate ids (same as the previous row-by-row build)
+    df = customers_df.drop_duplicates('customer_id', keep='last')
+    turnover = df['annual_turnover']
+    # Normalise each distinct segment once; code -1 (missing) indexes the
+    # trailing default entry
+    segment = df['customer_segment'].astype('category')
+    seg_lookup = np.array(
+        [resolve_customer_segment(s) for s in segment.cat.categories.tolist()]
+        + [resolve_customer_segment(None)],
+        dtype=object,
+    )
+    seg_values = seg_lookup[segment.cat.codes.to_numpy()]
+    tov_values = turnover.astype(object).where(turnover.notna(), None).to_numpy(dtype=object)
+
+    # One vectorized hash join; -1 marks ids absent from the customer file
+    pos = pd.Index(df['customer_id']).get_indexer(customer_ids)
+    found = pos >= 0
+    segments = np.full(len(pos), 'individual', dtype=object)
+    segments[found] = seg_values[pos[found]]
+    turnovers = np.full(len(pos), None, dtype=object)
+    turnovers[found] = tov_values[pos[found]]
+    return segments, turnovers
 
 
 def load_kpi_config_for_account(
@@ -139,12 +228,12 @@ def load_kpi_config_for_account(
     if not kpi_profile:
         return None
     kpi_config_path = project_root / "configs" / "kpis" / f"{kpi_profile}_kpis.yaml"
-    if not kpi_config_path.exists():
+    try:
+        return load_yaml_config(kpi_config_path)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"KPI config not found for profile '{kpi_profile}': {kpi_config_path}"
-        )
-    with open(kpi_config_path, "r") as f:
-        return yaml.safe_load(f)
+        ) from None
 
 
 # ---------------------------------------------------------------------------
@@ -154,6 +243,9 @@ def load_kpi_config_for_account(
 
 _EXEC_WIDTH = 59   # max line width including leading spaces
 
+# KPIs surfaced in the exec summary; missing or None values display as 0.0
+_EXEC_KPI_KEYS = ("digital_ratio", "paid_rail_dependency_ratio", "excess_atm_cost")
+
 def _exec_line(content: str) -> str:
     """Return a left-padded exec summary line, truncated to _EXEC_WIDTH."""
     line = f"  {content}"
@@ -178,11 +270,20 @@ def analyze_customer_for_account(
     account_config: dict,
     txns_df: pd.DataFrame,
     customer_row: dict,
-    project_root: Path
+    project_root: Path,
+    deposit_txn_count: int | None = None,
+    variable_fees: dict | None = None,
+    nedbank_atm_amounts: np.ndarray | None = None,
 ) -> dict:
     """
     Evaluate a specific account type for a single customer.
     Pure function (no printing, no global mutations).
+
+    Batch callers may pass deposit_txn_count, variable_fees (the
+    compute_variable_fees result for all customers under this account's
+    class) and nedbank_atm_amounts (this customer's absolute Nedbank ATM
+    withdrawal amounts) computed once up front; otherwise all are derived
+    from txns_df.
     """
     from fees.tariff_engine import (
         load_fee_schedule,
@@ -200,7 +301,7 @@ def analyze_customer_for_account(
     kpi_engine = KPIEngine(kpi_config) if kpi_config else None
 
     # 2. Extract Customer Info
-    customer_segment = customer_row.get('customer_segment', 'individual')
+    customer_segment = resolve_customer_segment(customer_row.get('customer_segment'))
     annual_turnover = customer_row.get('annual_turnover', None)
     if pd.isna(annual_turnover):
         annual_turnover = None
@@ -218,16 +319,18 @@ def analyze_customer_for_account(
     turnover_missing_flag = False
 
     # Variable fees from tariff engine
-    var_fees_result = compute_variable_fees(txns_df, fee_schedule, account_class)
+    if variable_fees is None:
+        variable_fees = compute_variable_fees(txns_df, fee_schedule, account_class)
     # result is a dict keyed by customer_id
     if not txns_df.empty:
         cust_id = txns_df.iloc[0]['customer_id']
-        customer_var_fees = var_fees_result.get(cust_id, {})
+        customer_var_fees = variable_fees.get(cust_id, {})
         tx_variable_fee = customer_var_fees.get('variable_total', 0.0)
         by_type_map = customer_var_fees.get('by_type', {})
 
         # Cash deposit fee
-        deposit_txn_count = int((txns_df['type'] == 'cash_deposit').sum())
+        if deposit_txn_count is None:
+            deposit_txn_count = int((txns_df['type'] == 'cash_deposit').sum())
         deposit_result = compute_cash_deposit_fee(
             customer_segment, annual_turnover, deposit_txn_count, fee_schedule,
         )
@@ -242,7 +345,8 @@ def analyze_customer_for_account(
         merged_drivers = dict(by_type_map)
         if deposit_fee > 0:
             merged_drivers['cash_deposit'] = merged_drivers.get('cash_deposit', 0.0) + deposit_fee
-        fee_drivers = sorted(merged_drivers.items(), key=lambda x: x[1], reverse=True)
+        if merged_drivers:
+            fee_drivers = sorted(merged_drivers.items(), key=itemgetter(1), reverse=True)
 
     total_fee = round(fixed_fee + variable_fee, 2)
 
@@ -268,6 +372,7 @@ def analyze_customer_for_account(
             customer_txns=txns_df,
             fee_schedule=fee_schedule,
             account_config=account_config,
+            nedbank_atm_amounts=nedbank_atm_amounts,
         )
         kpi_results = kpi_out.get("kpis")
         fit_score = kpi_out.get("account_fit_score")
@@ -314,15 +419,25 @@ def analyze_customer_for_account(
     }
 
 
-def print_exec_summary(customer_id: str, kpi_results: dict, account_config: dict) -> None:
+def format_exec_summary(
+    customer_id: str,
+    kpi_results: dict,
+    account_config: dict,
+    free_atm: int | None = None,
+) -> list:
     """
-    Print a compact EXEC SUMMARY block for a Basic Banking customer.
+    Build the compact EXEC SUMMARY block for a Basic Banking customer.
     All lines are guaranteed <= _EXEC_WIDTH (59) chars.
 
     Args:
         customer_id:   The customer identifier.
         kpi_results:   Output of kpi_engine.compute_all().
         account_config: Loaded account YAML (for free tier values).
+        free_atm:      Free Nedbank ATM withdrawals; pass it when formatting many
+                       customers to skip re-reading account_config each call.
+
+    Returns:
+        List of output lines (without trailing newlines).
     """
     kr = kpi_results
     kpis = kr["kpis"]
@@ -331,31 +446,23 @@ def print_exec_summary(customer_id: str, kpi_results: dict, account_config: dict
     benefits = kr.get("benefits", {})
 
     fit_score = int(round(kr["account_fit_score"]))
-    digi = kpis.get("digital_ratio", 0.0) or 0.0
-    paid_rail = kpis.get("paid_rail_dependency_ratio", 0.0) or 0.0
+    kpis_get = kpis.get
+    digi, paid_rail, excess_cost = [kpis_get(name) or 0.0 for name in _EXEC_KPI_KEYS]
 
-    free_atm = account_config.get("free_tier", {}).get("free_nedbank_atm_withdrawals", 3)
-    atm_total = kpis.get("free_atm_utilisation_ratio", 0.0) or 0.0
+    if free_atm is None:
+        free_atm = account_config.get("free_tier", {}).get("free_nedbank_atm_withdrawals", 3)
     # nedbank ATM count comes from features via kpis namespace
     # We derive atm_used from the ratio * free_atm (or just use features directly)
     atm_b = benefits.get("free_atm_withdrawals", {})
     atm_used = atm_b.get("usage", 0)
     excess_atm = max(atm_used - free_atm, 0)
-    excess_cost = kpis.get("excess_atm_cost", 0.0) or 0.0
 
     # CashOut, EFT->Ned, OnlineSub from benefits where available, else 0
     eft_b = benefits.get("free_eft_to_nedbank", {})
     sub_b = benefits.get("free_online_subscription", {})
 
-    # cashout_count is a KPI-adjacent feature value we need to surface
-    # It's computed inside features and passed through the kpi namespace
-    # We get it from kpis if it was passed through, or default 0
-    cashout_val = int(kpis.get("cashout_adoption_ratio", 0) * max(
-        int(atm_used) + int(eft_b.get("usage", 0)), 1
-    ) + 0.5)  # approximation fallback
-    # Better: cashout_count flows through to kpis from features via compute_kpis namespace
-    # But it's not a formula KPI — we need it from the raw features dict.
-    # We'll accept it via a separate "features" key in kpi_results if present.
+    # cashout_count is not a formula KPI, so it is read from the raw features
+    # stashed in kpi_results["_features"]
     cashout_count_raw = kr.get("_features", {}).get("cashout_count", 0)
     eft_to_ned = eft_b.get("usage", 0)
     online_sub = sub_b.get("usage", 0)
@@ -364,22 +471,36 @@ def print_exec_summary(customer_id: str, kpi_results: dict, account_config: dict
     next_msg = insights[0][:40] if insights else "n/a"  # truncate long messages
 
     sep = "-" * (_EXEC_WIDTH - 2)
-    print(_exec_line(f"-- {customer_id} BASIC BANKING \u2014 EXEC SUMMARY --"))
-    print(_exec_line(sep))
-    print(_exec_line(
-        f"Fit: {fit_score}/100  Digi: {digi:.2f}  PaidRail: {paid_rail:.2f}"
-    ))
-    print(_exec_line(
-        f"ATM: {atm_used} (Free {free_atm}, Excess {excess_atm})"
-        f"  ExcessCost: {_fmt_money(excess_cost)}"
-    ))
-    print(_exec_line(
-        f"CashOut: {cashout_count_raw}  EFT->Ned: {eft_to_ned}"
-        f"  OnlineSub: {_fmt_yn(online_sub)}"
-    ))
-    print(_exec_line(f"Signals: {sigs_str}"))
-    print(_exec_line(f"Next: {next_msg}"))
-    print(_exec_line(sep))
+    return [
+        _exec_line(f"-- {customer_id} BASIC BANKING \u2014 EXEC SUMMARY --"),
+        _exec_line(sep),
+        _exec_line(
+            f"Fit: {fit_score}/100  Digi: {digi:.2f}  PaidRail: {paid_rail:.2f}"
+        ),
+        _exec_line(
+            f"ATM: {atm_used} (Free {free_atm}, Excess {excess_atm})"
+            f"  ExcessCost: {_fmt_money(excess_cost)}"
+        ),
+        _exec_line(
+            f"CashOut: {cashout_count_raw}  EFT->Ned: {eft_to_ned}"
+            f"  OnlineSub: {_fmt_yn(online_sub)}"
+        ),
+        _exec_line(f"Signals: {sigs_str}"),
+        _exec_line(f"Next: {next_msg}"),
+        _exec_line(sep),
+    ]
+
+
+def print_exec_summary(customer_id: str, kpi_results: dict, account_config: dict) -> None:
+    """
+    Print a compact EXEC SUMMARY block for a Basic Banking customer.
+
+    Args:
+        customer_id:   The customer identifier.
+        kpi_results:   Output of kpi_engine.compute_all().
+        account_config: Loaded account YAML (for free tier values).
+    """
+    print("\n".join(format_exec_summary(customer_id, kpi_results, account_config)))
 
 
 # ---------------------------------------------------------------------------
@@ -449,6 +570,124 @@ def generate_recommendation(basic_result: dict, payu_result: dict) -> dict:
     }
 
 
+# ---------------------------------------------------------------------------
+# KPI stage (single mode)
+# ---------------------------------------------------------------------------
+
+# Below this many customers, worker start-up (each process imports pandas)
+# costs more than the per-customer KPI work it would spread out
+_PARALLEL_MIN_CUSTOMERS = 2000
+
+
+def _available_cpus() -> int:
+    """
+    Count the CPUs this process may run on.
+
+    Uses the scheduler affinity mask where the OS exposes it, so a container
+    pinned to a subset of a large host does not size its pool by the host's
+    core count; falls back to os.cpu_count() elsewhere (macOS, Windows).
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _compute_kpi_chunk(
+    chunk: list,
+    kpi_config: dict,
+    turnover_threshold: float,
+    fee_schedule: dict,
+    account_class: str,
+    account_config: dict,
+) -> list:
+    """
+    Run feature extraction and the KPI engine for a chunk of customers.
+
+    Module-level so it can be pickled to a worker process; each call builds
+    its own KPIEngine from kpi_config.
+
+    Args:
+        chunk: List of (tx_customer, customer_segment, annual_turnover) tuples.
+        kpi_config, turnover_threshold, fee_schedule, account_class,
+        account_config: Run-wide inputs, identical for every customer.
+
+    Returns:
+        List of kpi_results dicts, in chunk order, each carrying the raw
+        feature dict under "_features".
+    """
+    kpi_engine = KPIEngine(kpi_config)
+    results = []
+    for tx_customer, customer_segment, annual_turnover in chunk:
+        # The KPI contract needs the full per-customer feature set
+        # (charged_txn_count etc.), which the batch summary does not carry
+        features = extract_behavioural_features(
+            tx_customer,
+            customer_segment=customer_segment,
+            annual_turnover=annual_turnover,
+            turnover_threshold=turnover_threshold,
+            fee_schedule=fee_schedule,
+            account_class=account_class,
+        )
+        kpi_results = kpi_engine.compute_all(
+            features=features,
+            customer_txns=tx_customer,
+            fee_schedule=fee_schedule,
+            account_config=account_config,  # v0.3.1: enables compute_benefits
+        )
+        # v0.3.1: stash raw features for exec summary access (cashout_count etc.)
+        kpi_results["_features"] = features
+        results.append(kpi_results)
+    return results
+
+
+def compute_kpi_results(
+    tx_slices: list,
+    segments,
+    turnovers,
+    kpi_config: dict,
+    turnover_threshold: float,
+    fee_schedule: dict,
+    account_class: str,
+    account_config: dict,
+    max_workers: int | None = None,
+) -> list:
+    """
+    Compute KPI results for every customer, in input order.
+
+    Customers are independent, so large runs are split into chunks and fanned
+    out over a process pool; small runs stay in-process.
+
+    Args:
+        tx_slices:  Per-customer transaction DataFrames.
+        segments:   Customer segments aligned with tx_slices.
+        turnovers:  Annual turnovers aligned with tx_slices (None = unknown).
+        kpi_config: Loaded KPI YAML dict.
+        turnover_threshold, fee_schedule, account_class, account_config:
+                    Run-wide inputs passed to every customer.
+        max_workers: Process count; defaults to the CPUs available to this
+                    process (see _available_cpus).
+
+    Returns:
+        List of kpi_results dicts aligned with tx_slices.
+    """
+    items = list(zip(tx_slices, segments, turnovers))
+    shared = (kpi_config, turnover_threshold, fee_schedule, account_class, account_config)
+    workers = max_workers or _available_cpus()
+    if workers < 2 or len(items) < _PARALLEL_MIN_CUSTOMERS:
+        return _compute_kpi_chunk(items, *shared)
+
+    # A few chunks per worker balances load without paying per-customer IPC
+    chunk_size = -(-len(items) // (workers * 4))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_results in pool.map(
+            _compute_kpi_chunk, chunks, *[[arg] * len(chunks) for arg in shared]
+        ):
+            results.extend(chunk_results)
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -502,7 +741,7 @@ def main():
         # Default is already set, but logic requires --account presence for clarity
         pass
 
-    PROJECT_ROOT = find_project_root(Path(__file__).resolve())
+    PROJECT_ROOT = find_project_root(_THIS_FILE)
 
     # --- Mode: PORTFOLIO ---
     if args.mode == "portfolio":
@@ -517,17 +756,23 @@ def main():
     # --- Mode: SINGLE (Legacy/Default) ---
     account_type = args.account
 
-    PROJECT_ROOT = find_project_root(Path(__file__).resolve())
-
     account_filename = _ACCOUNT_CONFIG_MAP[account_type]
     config_path = PROJECT_ROOT / "configs" / "account_types" / account_filename
     fee_schedule_path = PROJECT_ROOT / "configs" / "fee_schedules" / "nedbank_2026_27.yaml"
     customers_path = PROJECT_ROOT / "data" / "synthetic" / "customers_sample.csv"
     tx_path = PROJECT_ROOT / "data" / "synthetic" / "transactions_sample.csv"
 
-    # Load configuration
-    account_config = load_account_config(str(config_path))
-    fee_schedule = load_fee_schedule(str(fee_schedule_path))
+    # Load configuration and data. The four reads are independent, so they are
+    # issued together to overlap their open/read latency.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        account_config_f = pool.submit(load_account_config, str(config_path))
+        fee_schedule_f = pool.submit(load_fee_schedule, str(fee_schedule_path))
+        transactions_f = pool.submit(load_transactions, str(tx_path))
+        customers_f = pool.submit(load_customers, str(customers_path))
+    account_config = account_config_f.result()
+    fee_schedule = fee_schedule_f.result()
+    transactions = transactions_f.result()
+    customers_df = customers_f.result()
 
     # Get account class for POS fee determination — config-driven, never hardcoded
     account_class = account_config.get('account_class', 'current')
@@ -544,11 +789,6 @@ def main():
     else:
         version_label = "v0.3.0"
 
-    # Load data
-    transactions = load_transactions(str(tx_path))
-    customers_df = load_customers(str(customers_path))
-    customer_map = build_customer_map(customers_df)
-
     # Extract turnover threshold from fee schedule config
     turnover_threshold = (
         fee_schedule.get('cash_deposit', {}).get('turnover_threshold', 1_300_000)
@@ -557,36 +797,68 @@ def main():
     # Compute variable fees for all customers (POS, ATM, online)
     variable_fees = compute_variable_fees(transactions, fee_schedule, account_class)
 
-    # Get unique customers
-    unique_customers = transactions["customer_id"].unique()
+    # Encode customer ids as first-seen integer codes once; grouping and the
+    # profile lookup below then work on codes rather than id strings
+    customer_codes, customer_ids = pd.factorize(transactions["customer_id"], sort=False)
+    customer_ids = customer_ids.tolist()
+    segments, turnovers = build_customer_map(customers_df, customer_ids)
+    n_customers = len(customer_ids)
+
+    # v0.3.0/v0.3.1: KPI results for all customers up front (parallel for large
+    # runs). Only this stage needs per-customer transaction frames, so the PAYU
+    # path never materializes them.
+    if kpi_engine is not None:
+        tx_slices = [tx for _, tx in transactions.groupby(customer_codes, sort=False)]
+        kpi_rows = compute_kpi_results(
+            tx_slices, segments, turnovers, kpi_config,
+            turnover_threshold, fee_schedule, account_class, account_config,
+        )
+    else:
+        kpi_rows = [None] * n_customers
 
-    results = []
+    # Report-level behaviour features (counts, flows, digital ratio, tag) for all
+    # customers from a single grouped aggregation
+    behaviour_rows = extract_behavioural_features_batch(transactions).to_dict(orient="index")
+
+    result_rows = []
     flagged_turnover_customers = []
 
-    for customer_id in unique_customers:
-        tx_customer = transactions[transactions["customer_id"] == customer_id]
+    # Loop invariants — bound once rather than re-read per customer
+    fixed_fee = account_config.get('monthly_fee', 0.0)
+    free_atm_tier = account_config.get("free_tier", {}).get(
+        "free_nedbank_atm_withdrawals", 3
+    )
+    empty = {}
+    # The deposit fee depends only on eligibility bucket and event count, and
+    # the fee schedule is fixed for the run, so few distinct results exist
+    deposit_fee_cache = {}
+    variable_fees_get = variable_fees.get
+
+    for code in range(n_customers):
 
         # Customer profile
-        cust_info = customer_map.get(customer_id, {
-            'customer_segment': 'individual',
-            'annual_turnover': None,
-        })
-        customer_segment = cust_info['customer_segment']
-        annual_turnover = cust_info['annual_turnover']
-
-        # Get fixed fee from config
-        fixed_fee = account_config.get('monthly_fee', 0.0)
+        customer_id = customer_ids[code]
+        customer_segment = segments[code]
+        annual_turnover = turnovers[code]
 
         # Get variable fee (POS, ATM, online) from tariff engine
-        customer_var_fees = variable_fees.get(customer_id, {})
+        customer_var_fees = variable_fees_get(customer_id) or empty
         tx_variable_fee = customer_var_fees.get('variable_total', 0.0)
-        by_type = customer_var_fees.get('by_type', {})
+        by_type = customer_var_fees.get('by_type', empty)
 
         # Cash deposit fee (v0.2.1)
-        deposit_txn_count = int((tx_customer['type'] == 'cash_deposit').sum())
-        deposit_result = compute_cash_deposit_fee(
-            customer_segment, annual_turnover, deposit_txn_count, fee_schedule,
+        behaviour = behaviour_rows[customer_id]
+        deposit_txn_count = behaviour['cash_deposit_count']
+        deposit_key = (
+            resolve_deposit_eligibility(customer_segment, annual_turnover, turnover_threshold),
+            deposit_txn_count,
         )
+        deposit_result = deposit_fee_cache.get(deposit_key)
+        if deposit_result is None:
+            deposit_result = compute_cash_deposit_fee(
+                customer_segment, annual_turnover, deposit_txn_count, fee_schedule,
+            )
+            deposit_fee_cache[deposit_key] = deposit_result
         deposit_fee = deposit_result['fee']
         eligibility_status = deposit_result['eligibility_status']
         deposit_flags = deposit_result['flags']
@@ -597,182 +869,161 @@ def main():
         variable_fee = round(tx_variable_fee + deposit_fee, 2)
         total_fee = round(fixed_fee + variable_fee, 2)
 
-        fee_drivers = dict(by_type)
+        # by_type is only read here, so copy it just when a deposit fee is merged in
+        fee_drivers = by_type
         if deposit_fee > 0:
+            fee_drivers = dict(by_type)
             fee_drivers['cash_deposit'] = fee_drivers.get('cash_deposit', 0.0) + deposit_fee
-        top_drivers = sorted(fee_drivers.items(), key=lambda x: x[1], reverse=True)[:3]
+        top_drivers = (
+            heapq.nlargest(3, fee_drivers.items(), key=itemgetter(1)) if fee_drivers else []
+        )
 
         show_deposit_line = (deposit_txn_count > 0) or deposit_flags.get(
             'turnover_required_for_deposit_fee', False
         )
 
-        # v0.3.0: extract features with fee_schedule for charged_txn_count
-        features = extract_behavioural_features(
-            tx_customer,
-            customer_segment=customer_segment,
-            annual_turnover=annual_turnover,
-            turnover_threshold=turnover_threshold,
-            fee_schedule=fee_schedule if kpi_engine else None,
-            account_class=account_class,
-        )
+        # v0.3.0/v0.3.1: KPI results (None for the PAYU path)
+        kpi_results = kpi_rows[code]
+        features = behaviour if kpi_results is None else kpi_results["_features"]
 
-        # v0.3.0/v0.3.1: compute KPI results if engine exists
-        kpi_results = None
-        if kpi_engine is not None:
-            kpi_results = kpi_engine.compute_all(
-                features=features,
-                customer_txns=tx_customer,
-                fee_schedule=fee_schedule,
-                account_config=account_config,  # v0.3.1: enables compute_benefits
-            )
-            # v0.3.1: stash raw features for exec summary access (cashout_count etc.)
-            kpi_results["_features"] = features
-
-        results.append({
-            'customer_id': customer_id,
-            'customer_segment': customer_segment,
-            'txn_count': features['txn_count'],
-            'digital_ratio': features['digital_ratio'],
-            'behaviour_tag': features['behaviour_tag'],
-            'total_inflow': features['total_inflow'],
-            'total_outflow': features['total_outflow'],
-            'fixed_fee': fixed_fee,
-            'variable_fee': variable_fee,
-            'total_fee': total_fee,
-            'top_drivers': top_drivers,
-            'deposit_fee': deposit_fee,
-            'deposit_eligibility': eligibility_status,
-            'deposit_txn_count': deposit_txn_count,
-            'show_deposit_line': show_deposit_line,
-            'kpi_results': kpi_results,  # v0.3.0: None for PAYU path
-            'features': features,         # v0.3.1: raw features for footer rollups
-        })
+        result_rows.append((
+            customer_id, customer_segment,
+            features['txn_count'], features['digital_ratio'], features['behaviour_tag'],
+            features['total_inflow'], features['total_outflow'],
+            fixed_fee, variable_fee, total_fee, top_drivers,
+            deposit_fee, eligibility_status, deposit_txn_count, show_deposit_line,
+            kpi_results, features,
+        ))
+
+    results_df = pd.DataFrame(result_rows, columns=_RESULT_COLUMNS)
 
     # -------------------------------------------------------------------------
     # Output
+    # Lines are collected and written once at the end rather than one print()
+    # (lock + write) per line.
     # -------------------------------------------------------------------------
+    out = []
+    emit = out.append
     account_type_id = account_config.get('account_type_id', account_type)
     account_name = account_config.get('account_name', account_type_id)
 
-    print("\n" + "=" * 70)
-    print(f"{account_name} Multi-Customer Intelligence Report  {version_label}")
-    print("=" * 70)
-    print(f"\nAccount Type: {account_type_id}")
-    print(f"Account Class: {account_class}  (POS pricing path: {account_class})")
-    print(f"Total Customers: {len(unique_customers)}")
-    print("")
-
-    for r in results:
-        seg_label = r['customer_segment'].upper()[:3]
-        line1 = (f"{r['customer_id']:<11} [{seg_label}] "
-                 f"{r['txn_count']:>3}tx {r['digital_ratio']*100:>5.1f}% "
-                 f"{r['behaviour_tag']:<17}")
-        line2 = f"  In: N${r['total_inflow']:>10,.2f}  Out: N${r['total_outflow']:>10,.2f}"
-        line3 = (f"  Fixed: N${r['fixed_fee']:>5.2f}  "
-                 f"Var: N${r['variable_fee']:>6.2f}  "
-                 f"Total: N${r['total_fee']:>6.2f}")
-
-        print(line1)
-        print(line2)
-        print(line3)
-
-        if r['show_deposit_line']:
-            dep_fee_str = f"N${r['deposit_fee']:.2f}" if r['deposit_fee'] > 0 else "FREE"
-            print(f"  Deposit: {r['deposit_eligibility']:<24}  {dep_fee_str} "
-                  f"({r['deposit_txn_count']} events)")
-
-        if r['top_drivers']:
+    emit("\n" + _REPORT_RULE)
+    emit(f"{account_name} Multi-Customer Intelligence Report  {version_label}")
+    emit(_REPORT_RULE)
+    emit(f"\nAccount Type: {account_type_id}")
+    emit(f"Account Class: {account_class}  (POS pricing path: {account_class})")
+    emit(f"Total Customers: {n_customers}")
+    emit("")
+
+    for (customer_id, customer_segment, txn_count, digital_ratio, behaviour_tag,
+         total_inflow, total_outflow, fixed_fee, variable_fee, total_fee,
+         top_drivers, deposit_fee, deposit_eligibility, deposit_txn_count,
+         show_deposit_line, kpi_results, _features) in results_df.itertuples(
+            index=False, name=None):
+        seg_label = customer_segment.upper()[:3]
+        # The three headline lines go out as a single buffer entry
+        emit(f"{customer_id:<11} [{seg_label}] "
+             f"{txn_count:>3}tx {digital_ratio*100:>5.1f}% "
+             f"{behaviour_tag:<17}\n"
+             f"  In: N${total_inflow:>10,.2f}  Out: N${total_outflow:>10,.2f}\n"
+             f"  Fixed: N${fixed_fee:>5.2f}  "
+             f"Var: N${variable_fee:>6.2f}  "
+             f"Total: N${total_fee:>6.2f}")
+
+        if show_deposit_line:
+            dep_fee_str = f"N${deposit_fee:.2f}" if deposit_fee > 0 else "FREE"
+            emit(f"  Deposit: {deposit_eligibility:<24}  {dep_fee_str} "
+                 f"({deposit_txn_count} events)")
+
+        if top_drivers:
             drivers_str = "  Top fees: " + ", ".join(
-                [f"{tx_type} N${amt:.2f}" for tx_type, amt in r['top_drivers']]
+                [f"{tx_type} N${amt:.2f}" for tx_type, amt in top_drivers]
             )
-            print(drivers_str)
+            emit(drivers_str)
 
         # v0.3.1: EXEC SUMMARY block (Basic Banking only)
-        if r['kpi_results'] is not None and kpi_engine is not None:
-            kr = r['kpi_results']
-            print_exec_summary(r['customer_id'], kr, account_config)
+        if kpi_results is not None and kpi_engine is not None:
+            out.extend(format_exec_summary(
+                customer_id, kpi_results, account_config, free_atm=free_atm_tier,
+            ))
 
-        print("")
+        emit("")
 
-    print("=" * 70)
+    emit(_REPORT_RULE)
 
     # -------------------------------------------------------------------------
     # Footer: behaviour distribution + assumptions
     # -------------------------------------------------------------------------
-    print("\nBehaviour Distribution:")
-    behaviour_counts: dict = {}
-    for r in results:
-        tag = r['behaviour_tag']
-        behaviour_counts[tag] = behaviour_counts.get(tag, 0) + 1
+    emit("\nBehaviour Distribution:")
+    behaviour_counts = Counter(results_df['behaviour_tag'].tolist())
     for tag, count in sorted(behaviour_counts.items()):
-        print(f"  {tag:<17} {count:>3} customers")
+        emit(f"  {tag:<17} {count:>3} customers")
 
     if not kpi_engine:
         # PAYU-specific deposit eligibility distribution (unchanged)
-        print("\nDeposit Eligibility Distribution:")
-        eligibility_counts: dict = {}
-        for r in results:
-            status = r['deposit_eligibility']
-            eligibility_counts[status] = eligibility_counts.get(status, 0) + 1
+        emit("\nDeposit Eligibility Distribution:")
+        eligibility_counts = Counter(results_df['deposit_eligibility'].tolist())
         for status, count in sorted(eligibility_counts.items()):
-            print(f"  {status:<28} {count:>3} customers")
+            emit(f"  {status:<28} {count:>3} customers")
 
-    avg_digital_ratio = sum(r['digital_ratio'] for r in results) / len(results)
-    avg_total_fee = sum(r['total_fee'] for r in results) / len(results)
-    print(f"\nAverage Digital Ratio: {avg_digital_ratio:.1%}")
-    print(f"Average Total Fee:     N${avg_total_fee:.2f}")
+    avg_digital_ratio = results_df['digital_ratio'].to_numpy(dtype=np.float64).mean()
+    avg_total_fee = results_df['total_fee'].to_numpy(dtype=np.float64).mean()
+    emit(f"\nAverage Digital Ratio: {avg_digital_ratio:.1%}")
+    emit(f"Average Total Fee:     N${avg_total_fee:.2f}")
 
     if kpi_engine:
-        kpi_scored = [r for r in results if r['kpi_results']]
+        kpi_scored = [
+            (kr, feats)
+            for kr, feats in zip(results_df['kpi_results'], results_df['features'])
+            if kr
+        ]
         if kpi_scored:
-            avg_fit = sum(
-                r['kpi_results']['account_fit_score'] for r in kpi_scored
-            ) / len(kpi_scored)
+            avg_fit = np.fromiter(
+                (kr['account_fit_score'] for kr, _ in kpi_scored),
+                dtype=np.float64, count=len(kpi_scored),
+            ).mean()
             n_signals = sum(
-                len(r['kpi_results']['migration_signals']) > 0 for r in kpi_scored
+                len(kr['migration_signals']) > 0 for kr, _ in kpi_scored
             )
-            print(f"Average Fit Score:     {avg_fit:.1f} / 100")
-            print(f"Customers with signal: {n_signals} / {len(kpi_scored)}")
+            emit(f"Average Fit Score:     {avg_fit:.1f} / 100")
+            emit(f"Customers with signal: {n_signals} / {len(kpi_scored)}")
 
             # v0.3.1: Footer rollups (Basic Banking specific)
-            free_atm_tier = account_config.get("free_tier", {}).get(
-                "free_nedbank_atm_withdrawals", 3
-            )
-            n_atm_excess = sum(
-                1 for r in kpi_scored
-                if r['features'].get('nedbank_atm_withdrawal_count', 0) > free_atm_tier
+            atm_counts = np.fromiter(
+                (feats.get('nedbank_atm_withdrawal_count', 0) for _, feats in kpi_scored),
+                dtype=np.int64, count=len(kpi_scored),
             )
-            n_cashout_shift = sum(
-                1 for r in kpi_scored
-                if 'cashout_shift_candidate' in r['kpi_results']['migration_signals']
+            n_atm_excess = int((atm_counts > free_atm_tier).sum())
+            signal_counts = Counter(
+                sig for kr, _ in kpi_scored for sig in kr['migration_signals']
             )
-            n_payu_upgrade = sum(
-                1 for r in kpi_scored
-                if 'payu_upgrade_candidate' in r['kpi_results']['migration_signals']
-            )
-            print(f"\nBasic Banking Rollups:")
-            print(f"  Exceeding free ATM tier ({free_atm_tier}): "
-                  f"{n_atm_excess} / {len(kpi_scored)}")
-            print(f"  cashout_shift_candidate:  "
-                  f"{n_cashout_shift} / {len(kpi_scored)}")
-            print(f"  payu_upgrade_candidate:   "
-                  f"{n_payu_upgrade} / {len(kpi_scored)}")
-
-    print("\n" + "-" * 70)
-    print("ASSUMPTIONS:")
+            n_cashout_shift = signal_counts['cashout_shift_candidate']
+            n_payu_upgrade = signal_counts['payu_upgrade_candidate']
+            emit(f"\nBasic Banking Rollups:")
+            emit(f"  Exceeding free ATM tier ({free_atm_tier}): "
+                 f"{n_atm_excess} / {len(kpi_scored)}")
+            emit(f"  cashout_shift_candidate:  "
+                 f"{n_cashout_shift} / {len(kpi_scored)}")
+            emit(f"  payu_upgrade_candidate:   "
+                 f"{n_payu_upgrade} / {len(kpi_scored)}")
+
+    emit("\n" + _REPORT_THIN_RULE)
+    emit("ASSUMPTIONS:")
     n_flagged = len(flagged_turnover_customers)
     if n_flagged > 0:
-        print(f"  * {n_flagged} customer(s) had missing annual_turnover with cash deposit activity")
-        print(f"    -> cash deposit fee NOT charged (policy: do_not_charge_flag)")
-        print(f"    -> flagged for manual turnover verification")
+        emit(f"  * {n_flagged} customer(s) had missing annual_turnover with cash deposit activity")
+        emit(f"    -> cash deposit fee NOT charged (policy: do_not_charge_flag)")
+        emit(f"    -> flagged for manual turnover verification")
     else:
-        print("  * No customers flagged for missing turnover")
-    print("  * account_class read from YAML — no hardcoded values")
-    print("  * Deposit fee value (N$25.00) is a placeholder pending Nedbank tariff publication")
+        emit("  * No customers flagged for missing turnover")
+    emit("  * account_class read from YAML — no hardcoded values")
+    emit("  * Deposit fee value (N$25.00) is a placeholder pending Nedbank tariff publication")
     if kpi_engine:
-        print("  * KPI engine formulas validated via AST SafeExpressionEvaluator — no unsafe eval")
-        print("  * excess_atm_cost derived from real Nedbank ATM per_step fee rule (N$10/N$300)")
-    print("=" * 70 + "\n")
+        emit("  * KPI engine formulas validated via AST SafeExpressionEvaluator — no unsafe eval")
+        emit("  * excess_atm_cost derived from real Nedbank ATM per_step fee rule (N$10/N$300)")
+    emit(_REPORT_RULE + "\n")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def run_compare_mode(customer_id: str, project_root: Path):
@@ -806,8 +1057,10 @@ def run_compare_mode(customer_id: str, project_root: Path):
     # Recommendation
     rec = generate_recommendation(basic_res, payu_res)
 
-    # Print Report (<= 59 chars)
-    print(clamp59(f"\nCOMPARE ACCOUNTS \u2014 {customer_id}"))
+    # Print Report (<= 59 chars), collected and written once
+    out = []
+    emit = out.append
+    emit(clamp59(f"\nCOMPARE ACCOUNTS \u2014 {customer_id}"))
     
     # Basic Banking section
     fit_b = f"{int(round(basic_res['account_fit_score']))}" if basic_res['account_fit_score'] is not None else "n/a"
@@ -818,7 +1071,7 @@ def run_compare_mode(customer_id: str, project_root: Path):
     else:
         cost_b = basic_res["cost_note"] or "fees n/a"
 
-    print(clamp59(f"Basic Banking: Fit {fit_b} Cost {cost_b}"))
+    emit(clamp59(f"Basic Banking: Fit {fit_b} Cost {cost_b}"))
     
     # Surface ATM excess for Basic Banking
     feat_b = basic_res.get("_features", {})
@@ -828,11 +1081,11 @@ def run_compare_mode(customer_id: str, project_root: Path):
     # Get excess cost from KPIs if available
     kpis_b = basic_res.get("kpis", {})
     excess_cost = kpis_b.get("excess_atm_cost", 0.0)
-    print(clamp59(f"  ATM Excess: {int(excess_atm)} ExcessCost: {fmt_money(excess_cost)}"))
+    emit(clamp59(f"  ATM Excess: {int(excess_atm)} ExcessCost: {fmt_money(excess_cost)}"))
     
     sigs = ", ".join(basic_res.get("migration_signals", [])) or "none"
-    print(clamp59(f"  Signals: {sigs}"))
-    print(clamp59(""))
+    emit(clamp59(f"  Signals: {sigs}"))
+    emit(clamp59(""))
 
     # Silver PAYU section
     fit_p = "n/a"
@@ -841,24 +1094,26 @@ def run_compare_mode(customer_id: str, project_root: Path):
     else:
         cost_p = payu_res["cost_note"] or "fees n/a"
 
-    print(clamp59(f"Silver PAYU: Fit {fit_p} Cost {cost_p}"))
+    emit(clamp59(f"Silver PAYU: Fit {fit_p} Cost {cost_p}"))
     
     fixed_p = payu_res['fees_dict']['fixed']
     var_p = payu_res['fees_dict']['variable']
-    print(clamp59(f"  Fixed {fmt_money(fixed_p)} Var {fmt_money(var_p)}"))
+    emit(clamp59(f"  Fixed {fmt_money(fixed_p)} Var {fmt_money(var_p)}"))
     
     top_p = ", ".join([d[0] for d in payu_res.get("top_fee_drivers", [])[:2]])
-    print(clamp59(f"  Top {top_p}"))
-    print(clamp59(""))
+    emit(clamp59(f"  Top {top_p}"))
+    emit(clamp59(""))
 
     # Recommendation section
-    print(clamp59("RECOMMENDATION:"))
-    print(clamp59(f"Choose {rec['recommended_account']}."))
+    emit(clamp59("RECOMMENDATION:"))
+    emit(clamp59(f"Choose {rec['recommended_account']}."))
     why = "; ".join(rec['reasons'])
-    print(clamp59(f"Why: {why}"))
+    emit(clamp59(f"Why: {why}"))
     if rec['alternative']:
-        print(clamp59(f"Alt: {rec['alternative']}"))
-    print("")
+        emit(clamp59(f"Alt: {rec['alternative']}"))
+    emit("")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def print_portfolio_report(aggregate: dict, targets: dict):
@@ -867,45 +1122,47 @@ def print_portfolio_report(aggregate: dict, targets: dict):
     Max line width: 59 chars.
     """
     agg = aggregate
-    print(clamp59("\n" + "=" * 59))
-    print(clamp59("PORTFOLIO \u2014 Retail Personal"))
-    print(clamp59(f"Customers: {agg['customer_count']}"))
+    out = []
+    emit = out.append
+    emit(clamp59("\n" + "=" * 59))
+    emit(clamp59("PORTFOLIO \u2014 Retail Personal"))
+    emit(clamp59(f"Customers: {agg['customer_count']}"))
     
     rc = agg["recommendation_counts"]
-    print(clamp59("Recommendations:"))
-    print(clamp59(f"  Basic: {rc['choose_basic_banking']}  PAYU: {rc['choose_silver_payu']}  Unknown: {rc['unknown']}"))
+    emit(clamp59("Recommendations:"))
+    emit(clamp59(f"  Basic: {rc['choose_basic_banking']}  PAYU: {rc['choose_silver_payu']}  Unknown: {rc['unknown']}"))
     
     sc = agg["signal_counts"]
-    print(clamp59("\nSignals (Basic):"))
-    print(clamp59(f"  payu_upgrade_candidate: {sc['payu_upgrade_candidate']}"))
-    print(clamp59(f"  cashout_shift_candidate: {sc['cashout_shift_candidate']}"))
-    print(clamp59(f"  digital_shift_candidate: {sc['digital_shift_candidate']}"))
+    emit(clamp59("\nSignals (Basic):"))
+    emit(clamp59(f"  payu_upgrade_candidate: {sc['payu_upgrade_candidate']}"))
+    emit(clamp59(f"  cashout_shift_candidate: {sc['cashout_shift_candidate']}"))
+    emit(clamp59(f"  digital_shift_candidate: {sc['digital_shift_candidate']}"))
     
-    print(clamp59("\nATM pressure:"))
-    print(clamp59(f"  Exceed free ATM tier: {agg['atm_pressure_count']} / {agg['customer_count']}"))
+    emit(clamp59("\nATM pressure:"))
+    emit(clamp59(f"  Exceed free ATM tier: {agg['atm_pressure_count']} / {agg['customer_count']}"))
     
     fp = agg["fee_pain"]
-    print(clamp59("\nPAYU fees (available only):"))
+    emit(clamp59("\nPAYU fees (available only):"))
     avg_str = fmt_money(fp['avg_payu_cost']) if fp['avg_payu_cost'] > 0 else "n/a"
     tot_str = fmt_money(fp['total_payu_cost']) if fp['total_payu_cost'] > 0 else "n/a"
-    print(clamp59(f"  Avg PAYU cost: {avg_str}"))
-    print(clamp59(f"  Total PAYU cost: {tot_str}"))
+    emit(clamp59(f"  Avg PAYU cost: {avg_str}"))
+    emit(clamp59(f"  Total PAYU cost: {tot_str}"))
 
-    print(clamp59("\nTOP PAYU UPGRADE TARGETS"))
+    emit(clamp59("\nTOP PAYU UPGRADE TARGETS"))
     for t in targets["top_payu_upgrade_targets"]:
-        print(clamp59(f"  {t['customer_id']:<10} {t['reason']}"))
+        emit(clamp59(f"  {t['customer_id']:<10} {t['reason']}"))
 
-    print(clamp59("\nTOP CASHOUT SHIFT TARGETS"))
+    emit(clamp59("\nTOP CASHOUT SHIFT TARGETS"))
     for t in targets["top_cashout_shift_targets"]:
-        print(clamp59(f"  {t['customer_id']:<10} {t['reason']}"))
+        emit(clamp59(f"  {t['customer_id']:<10} {t['reason']}"))
 
-    print(clamp59("\nTOP DIGITAL SHIFT TARGETS"))
+    emit(clamp59("\nTOP DIGITAL SHIFT TARGETS"))
     for t in targets["top_digital_shift_targets"]:
-        print(clamp59(f"  {t['customer_id']:<10} {t['reason']}"))
-
-    print(clamp59("=" * 59 + "\n"))
+        emit(clamp59(f"  {t['customer_id']:<10} {t['reason']}"))
 
+    emit(clamp59("=" * 59 + "\n"))
 
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def run_portfolio_mode(account_set_id: str, project_root: Path, limit: int, export_json_path: str = None):
@@ -916,12 +1173,11 @@ def run_portfolio_mode(account_set_id: str, project_root: Path, limit: int, expo
 
     # 1. Load account set config
     set_cfg_path = project_root / "configs" / "account_sets" / f"{account_set_id}.yaml"
-    if not set_cfg_path.exists():
+    try:
+        set_config = load_yaml_config(set_cfg_path)
+    except FileNotFoundError:
         print(clamp59(f"Error: Account set config {account_set_id} not found."))
         return
-    
-    with open(set_cfg_path, "r") as f:
-        set_config = yaml.safe_load(f)
 
     # 2. Load data
     customers_path = project_root / "data" / "synthetic" / "customers_sample.csv"
@@ -959,4 +1215,8 @@ def run_portfolio_mode(account_set_id: str, project_root: Path, limit: int, expo
 
 
 if __name__ == '__main__':
+    # Register this script under its package name so the deferred
+    # `from engine.account_fit import ...` in portfolio_engine reuses it rather
+    # than executing the whole module a second time.
+    sys.modules.setdefault("engine.account_fit", sys.modules[__name__])
     main()
@@ -19,9 +19,10 @@ than max() and min() are permitted.
 """
 
 import ast
-import math
-from typing import Any, Dict, List, Optional, Tuple
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -52,6 +53,10 @@ _SAFE_NODE_TYPES = (
     ast.keyword,
 )
 
+# Exact-type lookup table for the validator; ast.parse never yields
+# subclasses of these node types
+_SAFE_NODE_TYPE_SET = frozenset(_SAFE_NODE_TYPES)
+
 
 class SafeExpressionEvaluator:
     """
@@ -68,6 +73,11 @@ class SafeExpressionEvaluator:
                 imports, walrus operator, f-strings, starred expressions,
                 any function call other than max/min.
 
+    Formulas are parsed, validated and compiled once per process into a
+    lambda taking the referenced names positionally, so later evaluations
+    skip both re-parsing and building an eval namespace. The cache is shared
+    by all instances: batch callers build a fresh KPIEngine per customer.
+
     Raises:
         ValueError: If the formula contains disallowed AST nodes.
         NameError: If a referenced name is not in the evaluation namespace.
@@ -75,30 +85,72 @@ class SafeExpressionEvaluator:
 
     _ALLOWED_FUNCTIONS = {"max", "min"}
 
-    def _check_node(self, node: ast.AST) -> None:
-        """Recursively validate that all AST nodes are safe."""
-        if not isinstance(node, _SAFE_NODE_TYPES):
-            raise ValueError(
-                f"Disallowed expression in formula: {type(node).__name__}. "
-                "Only arithmetic, comparisons, boolean ops, name references, "
-                "and max()/min() calls are permitted."
-            )
-        # Extra guard: function calls must be max() or min() only
-        if isinstance(node, ast.Call):
-            if not isinstance(node.func, ast.Name):
-                raise ValueError(
-                    "Only simple function calls (max, min) are permitted — "
-                    f"got {ast.dump(node.func)}"
-                )
-            if node.func.id not in self._ALLOWED_FUNCTIONS:
+    # formula -> (code object, compiled lambda, lambda argument names)
+    _cache: Dict[str, Tuple[CodeType, Callable[..., Any], Tuple[str, ...]]] = {}
+
+    def _check_node(self, root: ast.AST) -> None:
+        """Validate that root and every AST node beneath it are safe."""
+        for node in ast.walk(root):
+            node_type = type(node)
+            if node_type not in _SAFE_NODE_TYPE_SET:
                 raise ValueError(
-                    f"Function '{node.func.id}' is not allowed in formulas. "
-                    f"Permitted: {self._ALLOWED_FUNCTIONS}"
+                    f"Disallowed expression in formula: {node_type.__name__}. "
+                    "Only arithmetic, comparisons, boolean ops, name references, "
+                    "and max()/min() calls are permitted."
                 )
-            if node.keywords:
-                raise ValueError("Keyword arguments are not permitted in max()/min() calls.")
-        for child in ast.iter_child_nodes(node):
-            self._check_node(child)
+            # Extra guard: function calls must be max() or min() only
+            if node_type is ast.Call:
+                if type(node.func) is not ast.Name:
+                    raise ValueError(
+                        "Only simple function calls (max, min) are permitted — "
+                        f"got {ast.dump(node.func)}"
+                    )
+                if node.func.id not in self._ALLOWED_FUNCTIONS:
+                    raise ValueError(
+                        f"Function '{node.func.id}' is not allowed in formulas. "
+                        f"Permitted: {self._ALLOWED_FUNCTIONS}"
+                    )
+                if node.keywords:
+                    raise ValueError("Keyword arguments are not permitted in max()/min() calls.")
+
+    def _compile(self, formula: str) -> Tuple[CodeType, Callable[..., Any], Tuple[str, ...]]:
+        """Parse, validate and compile a formula, caching the result."""
+        cached = self._cache.get(formula)
+        if cached is not None:
+            return cached
+
+        try:
+            tree = ast.parse(formula, mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Formula syntax error: '{formula}' — {exc}") from exc
+
+        self._check_node(tree.body)
+
+        code = compile(tree, filename="<kpi_formula>", mode="eval")
+
+        # Same validated body wrapped as `lambda <names>: <formula>`: names
+        # become fast locals and max/min the only globals
+        arg_names = tuple(sorted(
+            {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+            - self._ALLOWED_FUNCTIONS
+        ))
+        lambda_tree = ast.Expression(body=ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[], args=[ast.arg(arg=name) for name in arg_names],
+                kwonlyargs=[], kw_defaults=[], defaults=[],
+            ),
+            body=tree.body,
+        ))
+        ast.fix_missing_locations(lambda_tree)
+        fn = eval(  # noqa: S307 — validated body, builtins blanked
+            compile(lambda_tree, filename="<kpi_formula>", mode="eval"),
+            {"__builtins__": {}, "max": max, "min": min},
+        )
+
+        # Only formulas that pass validation are cached
+        cached = (code, fn, arg_names)
+        self._cache[formula] = cached
+        return cached
 
     def evaluate(self, formula: str, namespace: Dict[str, Any]) -> Any:
         """
@@ -117,18 +169,16 @@ class SafeExpressionEvaluator:
             ZeroDivisionError: Should not occur if formulas use max(..., 1); but
                                callers should still protect against it.
         """
-        try:
-            tree = ast.parse(formula, mode="eval")
-        except SyntaxError as exc:
-            raise ValueError(f"Formula syntax error: '{formula}' — {exc}") from exc
+        code, fn, arg_names = self._compile(formula)
 
-        self._check_node(tree.body)
-
-        # Build a safe eval namespace with only max/min builtins
-        safe_namespace = {"max": max, "min": min, **namespace}
-        # Compile and evaluate
-        code = compile(tree, filename="<kpi_formula>", mode="eval")
-        return eval(code, {"__builtins__": {}}, safe_namespace)  # noqa: S307 — builtins blanked
+        try:
+            args = [namespace[name] for name in arg_names]
+        except KeyError:
+            # A name is missing: evaluate in a namespace instead so NameError
+            # (or a short-circuit that never reaches the name) behaves as before
+            safe_namespace = {"max": max, "min": min, **namespace}
+            return eval(code, {"__builtins__": {}}, safe_namespace)  # noqa: S307 — builtins blanked
+        return fn(*args)  # noqa: S307 — builtins blanked
 
 
 # ---------------------------------------------------------------------------
@@ -154,6 +204,25 @@ class KPIEngine:
         self._north_star: Dict[str, Any] = kpi_config.get("north_star", {})
         self._evaluator = SafeExpressionEvaluator()
 
+        # Each signal's condition list joined into one short-circuiting
+        # "(c1) and (c2) and ..." formula, evaluated once per customer.
+        # v0.3.1: accept both 'all:' and 'conditions:' key styles; signals
+        # without conditions never fire and are left out.
+        self._signal_formulas: Dict[str, str] = {}
+        for signal_name, signal_def in self._signals_def.items():
+            conditions: List[str] = signal_def.get("all", signal_def.get("conditions", []))
+            if conditions:
+                self._signal_formulas[signal_name] = " and ".join(
+                    f"({cond})" for cond in conditions
+                )
+
+        # Fit score constants, converted once rather than per customer
+        self._base_score = float(self._north_star.get("base", 100))
+        self._signal_penalties: Dict[str, float] = {
+            signal_name: float(signal_def.get("penalty", 10))
+            for signal_name, signal_def in self._signals_def.items()
+        }
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -164,6 +233,7 @@ class KPIEngine:
         customer_txns: Optional[pd.DataFrame] = None,
         fee_schedule: Optional[Dict[str, Any]] = None,
         account_config: Optional[Dict[str, Any]] = None,  # v0.3.1
+        nedbank_atm_amounts: Optional[np.ndarray] = None,
     ) -> Dict[str, Any]:
         """
         Run the full KPI pipeline for one customer.
@@ -174,6 +244,8 @@ class KPIEngine:
                            excess_atm_cost computation via tariff engine).
             fee_schedule:  Loaded fee schedule dict (nedbank_2026_27.yaml).
             account_config: Loaded account YAML dict (needed for compute_benefits). (v0.3.1)
+            nedbank_atm_amounts: Optional pre-filtered absolute Nedbank ATM
+                           withdrawal amounts; see compute_excess_atm_cost().
 
         Returns:
             {
@@ -186,7 +258,7 @@ class KPIEngine:
         """
         kpis = self.compute_kpis(features)
         kpis["excess_atm_cost"] = self.compute_excess_atm_cost(
-            features, customer_txns, fee_schedule
+            features, customer_txns, fee_schedule, nedbank_atm_amounts
         )
         signals = self.evaluate_migration_signals(kpis)
         score = self.compute_account_fit_score(kpis, signals)
@@ -247,6 +319,7 @@ class KPIEngine:
         features: Dict[str, Any],
         customer_txns: Optional[pd.DataFrame],
         fee_schedule: Optional[Dict[str, Any]],
+        nedbank_atm_amounts: Optional[np.ndarray] = None,
     ) -> float:
         """
         Compute actual monetary cost of excess Nedbank ATM withdrawals.
@@ -266,11 +339,15 @@ class KPIEngine:
                            If None or missing, returns 0.0.
             fee_schedule:  Loaded fee schedule YAML dict.
                            If None, returns 0.0.
+            nedbank_atm_amounts: Absolute amounts of this customer's Nedbank ATM
+                           withdrawals, in any order. Batch callers filter the
+                           full frame once and pass these; when given,
+                           customer_txns is not re-filtered.
 
         Returns:
             Excess ATM cost in NAD (float).
         """
-        if customer_txns is None or fee_schedule is None:
+        if fee_schedule is None or (customer_txns is None and nedbank_atm_amounts is None):
             return 0.0
 
         free_tier_count: int = int(self._free_tier.get("free_nedbank_atm_withdrawals", 0))
@@ -280,21 +357,26 @@ class KPIEngine:
         if excess_count == 0:
             return 0.0
 
-        # Filter to Nedbank ATM withdrawal transactions only
-        if "atm_owner" not in customer_txns.columns or "type" not in customer_txns.columns:
-            return 0.0
-
-        nedbank_atm_txns = customer_txns[
-            (customer_txns["type"] == "atm_withdrawal") &
-            (customer_txns["atm_owner"] == "nedbank")
-        ]["amount"].abs().sort_values().tolist()
+        if nedbank_atm_amounts is None:
+            # Filter to Nedbank ATM withdrawal transactions only
+            if "atm_owner" not in customer_txns.columns or "type" not in customer_txns.columns:
+                return 0.0
+
+            is_nedbank_atm = (
+                (customer_txns["type"] == "atm_withdrawal") &
+                (customer_txns["atm_owner"] == "nedbank")
+            ).to_numpy()
+            nedbank_atm_amounts = np.abs(
+                customer_txns["amount"].to_numpy(dtype=np.float64)[is_nedbank_atm]
+            )
+        nedbank_atm_amounts = np.sort(nedbank_atm_amounts)
 
-        if not nedbank_atm_txns:
+        if nedbank_atm_amounts.size == 0:
             return 0.0
 
         # The free tier covers the first N withdrawals (cheapest first to be conservative).
         # "excess" = the withdrawals beyond the free tier count.
-        excess_txns = nedbank_atm_txns[free_tier_count:]  # amounts for excess withdrawals
+        excess_txns = nedbank_atm_amounts[free_tier_count:]  # amounts for excess withdrawals
 
         # Apply real Nedbank ATM fee rule from fee schedule
         atm_rule = fee_schedule.get("atm", {}).get("nedbank_atm_withdrawal", {})
@@ -302,11 +384,8 @@ class KPIEngine:
         step_amount = atm_rule.get("step_amount", 300)
         step_fee = atm_rule.get("step_fee", 10.0)
 
-        total_excess_cost = 0.0
         if rule_type == "per_step":
-            for amount in excess_txns:
-                steps = math.ceil(amount / step_amount)
-                total_excess_cost += steps * step_fee
+            total_excess_cost = float((np.ceil(excess_txns / step_amount) * step_fee).sum())
         else:
             # Fallback: flat per withdrawal (unknown rule type)
             total_excess_cost = float(len(excess_txns)) * step_fee
@@ -334,16 +413,9 @@ class KPIEngine:
         # Build namespace from kpis (skip None values — computed-but-not-yet-set)
         namespace = {k: v for k, v in kpis.items() if v is not None}
 
-        for signal_name, signal_def in self._signals_def.items():
-            # v0.3.1: accept both 'all:' and 'conditions:' key styles
-            conditions: List[str] = signal_def.get("all", signal_def.get("conditions", []))
-            if not conditions:
-                continue
+        for signal_name, formula in self._signal_formulas.items():
             try:
-                all_true = all(
-                    bool(self._evaluator.evaluate(cond, namespace))
-                    for cond in conditions
-                )
+                all_true = bool(self._evaluator.evaluate(formula, namespace))
             except Exception:
                 # If a condition can't be evaluated (e.g. missing KPI), skip silently
                 all_true = False
@@ -370,13 +442,11 @@ class KPIEngine:
         Returns:
             Account fit score as a float between 0 and 100.
         """
-        base: float = float(self._north_star.get("base", 100))
-        score = base
+        score = self._base_score
 
+        penalties = self._signal_penalties
         for signal_name in signals:
-            signal_def = self._signals_def.get(signal_name, {})
-            penalty = float(signal_def.get("penalty", 10))
-            score -= penalty
+            score -= penalties.get(signal_name, 10.0)
 
         return max(0.0, min(100.0, round(score, 1)))
 
@@ -402,6 +472,7 @@ class KPIEngine:
         """
         messages: List[str] = []
         namespace = {k: v for k, v in kpis.items() if v is not None}
+        fired = frozenset(signals)   # O(1) membership for each insight rule
 
         for insight_key, insight_def in self._insights_def.items():
             if insight_key == "good_fit":
@@ -413,13 +484,13 @@ class KPIEngine:
 
             fires = False
             # v0.3.1 signal-keyed style: the insight_key itself is a signal name
-            if insight_key in signals:
+            if insight_key in fired:
                 fires = True
 
             # Backward-compat: old 'signal:' / 'trigger:' keys still work
             if not fires:
                 signal_match = insight_def.get("signal")
-                if signal_match and signal_match in signals:
+                if signal_match and signal_match in fired:
                     fires = True
             if not fires:
                 trigger_expr = insight_def.get("trigger")
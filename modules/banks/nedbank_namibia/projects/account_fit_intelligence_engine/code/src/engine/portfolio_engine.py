@@ -4,19 +4,58 @@ Portfolio Engine — v0.5.0
 Core logic for batch customer analysis, portfolio aggregation, and targeting.
 """
 
-import pandas as pd
+import heapq
+from operator import itemgetter
+
+import numpy as np
 from pathlib import Path
-import yaml
 from config import load_account_config
+from fees.tariff_engine import load_fee_schedule, compute_variable_fees
 
 def run_portfolio(account_ids, txns_df, customers_df, project_root):
     """
     Run analysis for all customers across all accounts in the set.
     """
-    from engine.account_fit import analyze_customer_for_account, generate_recommendation
+    from engine.account_fit import (
+        analyze_customer_for_account,
+        generate_recommendation,
+        resolve_customer_segment,
+    )
 
     results = {}
-    unique_customers = txns_df["customer_id"].unique()
+
+    # Partition transactions and index customer rows once (first row wins on
+    # duplicate ids) instead of boolean-mask scans per customer
+    tx_groups = txns_df.groupby("customer_id", sort=False, observed=True)
+    first_rows = customers_df.drop_duplicates("customer_id", keep="first")
+    customer_rows = dict(zip(first_rows["customer_id"], first_rows.to_dict("records")))
+    # Same segment normalisation as single mode (blank -> individual)
+    for row in customer_rows.values():
+        row["customer_segment"] = resolve_customer_segment(row.get("customer_segment"))
+
+    # Cash deposit counts for every customer in one vectorized scan
+    deposit_counts = (
+        txns_df["type"].eq("cash_deposit")
+        .groupby(txns_df["customer_id"], sort=False, observed=True).sum()
+        .to_dict()
+    )
+
+    # Nedbank ATM withdrawal amounts per customer for excess ATM costing,
+    # filtered once over the full frame (None: no atm_owner column, so the
+    # per-customer path decides)
+    atm_amounts_by_customer = None
+    if "atm_owner" in txns_df.columns:
+        is_nedbank_atm = (
+            txns_df["type"].eq("atm_withdrawal") & txns_df["atm_owner"].eq("nedbank")
+        )
+        atm_amounts = txns_df["amount"].abs()[is_nedbank_atm]
+        atm_amounts_by_customer = {
+            customer_id: amounts.to_numpy()
+            for customer_id, amounts in atm_amounts.groupby(
+                txns_df["customer_id"][is_nedbank_atm], sort=False, observed=True
+            )
+        }
+    no_atm_amounts = np.empty(0)
 
     # Pre-load account configs
     account_configs = {}
@@ -24,9 +63,25 @@ def run_portfolio(account_ids, txns_df, customers_df, project_root):
         cfg_path = project_root / "configs" / "account_types" / f"{acc_id}.yaml"
         account_configs[acc_id] = load_account_config(str(cfg_path))
 
-    for customer_id in unique_customers:
-        cust_txns = txns_df[txns_df["customer_id"] == customer_id]
-        customer_row = customers_df[customers_df["customer_id"] == customer_id].iloc[0].to_dict()
+    # Variable fees for all customers, once per account class rather than
+    # once per customer per account
+    fee_schedule = load_fee_schedule(
+        str(project_root / "configs" / "fee_schedules" / "nedbank_2026_27.yaml")
+    )
+    fees_by_class = {}
+    for cfg in account_configs.values():
+        account_class = cfg.get("account_class", "current")
+        if account_class not in fees_by_class:
+            fees_by_class[account_class] = compute_variable_fees(
+                txns_df, fee_schedule, account_class
+            )
+
+    for customer_id, cust_txns in tx_groups:
+        customer_row = customer_rows[customer_id]
+        nedbank_atm_amounts = (
+            atm_amounts_by_customer.get(customer_id, no_atm_amounts)
+            if atm_amounts_by_customer is not None else None
+        )
         
         cust_results = {"accounts": {}}
         
@@ -36,7 +91,12 @@ def run_portfolio(account_ids, txns_df, customers_df, project_root):
                 account_configs[acc_id],
                 cust_txns,
                 customer_row,
-                project_root
+                project_root,
+                deposit_txn_count=int(deposit_counts[customer_id]),
+                variable_fees=fees_by_class[
+                    account_configs[acc_id].get("account_class", "current")
+                ],
+                nedbank_atm_amounts=nedbank_atm_amounts,
             )
             cust_results["accounts"][acc_id] = res
             
@@ -90,9 +150,9 @@ def aggregate_portfolio(portfolio_results):
         # Signals & ATM pressure (from Basic Banking results)
         basic_res = res["accounts"].get("basic_banking", {})
         if basic_res:
-            sigs = basic_res.get("migration_signals", [])
-            for sig in signal_counts:
-                if sig in sigs:
+            # Signal names are unique per customer; count only tracked ones
+            for sig in basic_res.get("migration_signals", []):
+                if sig in signal_counts:
                     signal_counts[sig] += 1
             
             # ATM Pressure: excess_atm_withdrawals > 0
@@ -152,7 +212,6 @@ def rank_targets(portfolio_results, limit=10):
             "has_signal": "payu_upgrade_candidate" in sigs,
             "excess_atm": excess_atm,
             "paid_rail": paid_rail,
-            "reason": clamp59(f"ATMex {int(excess_atm)} PaidRail {paid_rail:.2f}")
         })
         
         # 2. Cashout Shift Targets
@@ -160,7 +219,6 @@ def rank_targets(portfolio_results, limit=10):
             "customer_id": cust_id,
             "has_signal": "cashout_shift_candidate" in sigs,
             "atm_count": atm_used,
-            "reason": clamp59(f"ATM Count {int(atm_used)}")
         })
         
         # 3. Digital Shift Targets
@@ -169,21 +227,33 @@ def rank_targets(portfolio_results, limit=10):
             "customer_id": cust_id,
             "has_signal": "digital_shift_candidate" in sigs,
             "digi_ratio": digi_ratio,
-            "reason": clamp59(f"DigiRatio {digi_ratio:.2f}")
         })
 
-    # Sorting
+    # Selection: heapq.nlargest matches a stable reverse sort truncated to
+    # limit (ties keep portfolio order) without sorting the whole portfolio
     # upgrade_list: signal desc, excess_atm desc, paid_rail desc
-    upgrade_list.sort(key=lambda x: (x["has_signal"], x["excess_atm"], x["paid_rail"]), reverse=True)
-    
+    upgrade_top = heapq.nlargest(
+        limit, upgrade_list, key=itemgetter("has_signal", "excess_atm", "paid_rail")
+    )
+
     # cashout_list: signal desc, atm_count desc
-    cashout_list.sort(key=lambda x: (x["has_signal"], x["atm_count"]), reverse=True)
-    
+    cashout_top = heapq.nlargest(limit, cashout_list, key=itemgetter("has_signal", "atm_count"))
+
     # digital_list: signal desc, digi_ratio asc
-    digital_list.sort(key=lambda x: (x["has_signal"], -x["digi_ratio"]), reverse=True)
+    digital_top = heapq.nlargest(
+        limit, digital_list, key=lambda x: (x["has_signal"], -x["digi_ratio"])
+    )
+
+    # Reasons are only formatted for the customers that are returned
+    for t in upgrade_top:
+        t["reason"] = clamp59(f"ATMex {int(t['excess_atm'])} PaidRail {t['paid_rail']:.2f}")
+    for t in cashout_top:
+        t["reason"] = clamp59(f"ATM Count {int(t['atm_count'])}")
+    for t in digital_top:
+        t["reason"] = clamp59(f"DigiRatio {t['digi_ratio']:.2f}")
 
     return {
-        "top_payu_upgrade_targets": upgrade_list[:limit],
-        "top_cashout_shift_targets": cashout_list[:limit],
-        "top_digital_shift_targets": digital_list[:limit]
+        "top_payu_upgrade_targets": upgrade_top,
+        "top_cashout_shift_targets": cashout_top,
+        "top_digital_shift_targets": digital_top
     }
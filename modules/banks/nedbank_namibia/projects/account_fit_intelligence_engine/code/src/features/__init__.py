@@ -0,0 +1 @@
+"""Behavioural feature engineering."""
@@ -25,15 +25,18 @@ Changes in v0.3.1 (additive only):
 - Handles missing columns gracefully (transfer_scope, channel may be absent in older CSVs)
 """
 
+from collections import Counter
+
+import numpy as np
 import pandas as pd
 from typing import Any, Dict, Optional
 
 # Import shared eligibility helper — single source of logic, no duplication
-from fees.tariff_engine import resolve_deposit_eligibility, compute_variable_fees
+from fees.tariff_engine import resolve_deposit_eligibility, compute_transaction_fees
 
 
-# Transaction type categories
-DIGITAL_TYPES = {
+# Transaction type categories (frozen: shared read-only membership constants)
+DIGITAL_TYPES = frozenset({
     "pos_purchase",
     "airtime_purchase",
     "electricity_purchase",
@@ -41,10 +44,10 @@ DIGITAL_TYPES = {
     "eft_transfer",
     "eft_transfer_internal",   # v0.3.1
     "eft_transfer_external",   # v0.3.1
-}
+})
 
 # Transaction types considered as "payments" (everything except income + cash_deposit)
-PAYMENT_TYPES = {
+PAYMENT_TYPES = frozenset({
     "pos_purchase",
     "airtime_purchase",
     "electricity_purchase",
@@ -54,12 +57,75 @@ PAYMENT_TYPES = {
     "eft_transfer_external",   # v0.3.1
     "atm_withdrawal",
     "cashout",
-}
+})
 
-INFLOW_TYPES = {"income"}
+INFLOW_TYPES = frozenset({"income"})
+
+_UTILITY_TYPES = frozenset({"airtime_purchase", "electricity_purchase"})
 
 # Digital channels for online_subscription_used feature
-_DIGITAL_CHANNELS = {"online", "app", "ussd"}
+_DIGITAL_CHANNELS = frozenset({"online", "app", "ussd"})
+
+# Feature dict for a customer with no transactions, in return-dict key order;
+# deposit_fee_eligibility_status is filled in per call
+_EMPTY_FEATURES = {
+    "txn_count": 0,
+    "total_inflow": 0.0,
+    "total_outflow": 0.0,
+    "atm_withdrawal_count": 0,
+    "cash_deposit_count": 0,
+    "utility_count": 0,
+    "third_party_payment_count": 0,
+    "digital_ratio": 0.0,
+    "behaviour_tag": "no_activity",
+    "deposit_fee_eligibility_status": None,
+    "nedbank_atm_withdrawal_count": 0,
+    "cashout_count": 0,
+    "digital_txn_count": 0,
+    "total_payments": 0,
+    "pos_purchase_count": 0,
+    "charged_txn_count": 0,
+    "online_subscription_used": 0,
+    "eft_to_nedbank_count": 0,
+    "eft_to_otherbank_count": 0,
+}
+
+
+def _behaviour_tag(
+    txn_count: int,
+    atm_count: int,
+    digital_ratio: float,
+    utility_count: int,
+) -> str:
+    """Simple rule-based behaviour tag (per customer; see _behaviour_tags for the batch form)."""
+    if txn_count == 0:
+        return "no_activity"
+    if atm_count / max(txn_count, 1) >= 0.4:
+        return "cash_heavy"
+    if digital_ratio >= 0.7:
+        return "digital_first"
+    if utility_count >= 3:
+        return "utilities_focused"
+    return "mixed_usage"
+
+
+def _behaviour_tags(
+    txn_count: pd.Series,
+    atm_count: pd.Series,
+    digital_ratio: pd.Series,
+    utility_count: pd.Series,
+) -> np.ndarray:
+    """Vectorized _behaviour_tag over aligned per-customer columns (same rule order)."""
+    return np.select(
+        [
+            txn_count.to_numpy() == 0,
+            atm_count.to_numpy() / np.maximum(txn_count.to_numpy(), 1) >= 0.4,
+            digital_ratio.to_numpy() >= 0.7,
+            utility_count.to_numpy() >= 3,
+        ],
+        ["no_activity", "cash_heavy", "digital_first", "utilities_focused"],
+        default="mixed_usage",
+    ).astype(object)
 
 
 def extract_behavioural_features(
@@ -121,36 +187,53 @@ def extract_behavioural_features(
         >>> features = extract_behavioural_features(customer_txns)
         >>> print(f"Digital ratio: {features['digital_ratio']:.2%}")
     """
-    tx = transactions.copy()
+    # Read-only alias: nothing below mutates the caller's frame, so no copy
+    tx = transactions
 
     # Basic counts
     txn_count = len(tx)
 
-    # Inflow vs outflow
-    inflow = tx.loc[tx["type"].isin(INFLOW_TYPES), "amount"].sum()
-    outflow = tx.loc[~tx["type"].isin(INFLOW_TYPES), "amount"].sum()
+    # No activity: every count and flow is zero, so skip the column work
+    if txn_count == 0:
+        features = dict(_EMPTY_FEATURES)
+        features["deposit_fee_eligibility_status"] = resolve_deposit_eligibility(
+            customer_segment, annual_turnover, turnover_threshold
+        )
+        return features
+
+    # Raw column arrays for the masks below: numpy comparisons on a
+    # customer-sized slice skip the per-op Series wrapping pandas adds
+    type_arr = tx["type"].to_numpy()
+
+    # Tally the type column once; every per-type count below is a lookup.
+    # A hash count rather than np.unique: no sort, and missing values
+    # (which cannot be ordered against strings) are simply another key
+    type_counts = Counter(type_arr.tolist())
+
+    # Tally values are already Python ints, so the sum needs no cast
+    def count_types(types) -> int:
+        return sum(type_counts.get(t, 0) for t in types)
+
+    # Inflow vs outflow: one mask, two masked reductions on the raw array
+    # (nansum skips missing amounts like Series.sum; outflow is summed
+    # directly rather than as total - inflow to keep identical rounding)
+    amounts = tx["amount"].to_numpy(dtype=np.float64)
+    is_inflow = np.isin(type_arr, tuple(INFLOW_TYPES))
+    inflow = np.nansum(amounts[is_inflow])
+    outflow = np.nansum(amounts[~is_inflow])
 
     # --- Existing transaction type counts ---
-    atm_count = int((tx["type"] == "atm_withdrawal").sum())
-    cash_deposit_count = int((tx["type"] == "cash_deposit").sum())   # v0.2.1
-    utility_count = int(tx["type"].isin({"airtime_purchase", "electricity_purchase"}).sum())
-    third_party_count = int((tx["type"] == "third_party_payment").sum())
+    atm_count = count_types(("atm_withdrawal",))
+    cash_deposit_count = count_types(("cash_deposit",))   # v0.2.1
+    utility_count = count_types(_UTILITY_TYPES)
+    third_party_count = count_types(("third_party_payment",))
 
     # Digital usage ratio (cash_deposit is a branch event — not digital)
-    digital_count = int(tx["type"].isin(DIGITAL_TYPES).sum())
-    digital_ratio = (digital_count / txn_count) if txn_count else 0.0
+    digital_count = count_types(DIGITAL_TYPES)
+    digital_ratio = digital_count / txn_count   # txn_count >= 1 past the early return
 
     # Simple behaviour tagging (rule-based, explainable)
-    if txn_count == 0:
-        tag = "no_activity"
-    elif atm_count / max(txn_count, 1) >= 0.4:
-        tag = "cash_heavy"
-    elif digital_ratio >= 0.7:
-        tag = "digital_first"
-    elif utility_count >= 3:
-        tag = "utilities_focused"
-    else:
-        tag = "mixed_usage"
+    tag = _behaviour_tag(txn_count, atm_count, digital_ratio, utility_count)
 
     # v0.2.1: deposit eligibility status — uses shared helper from tariff_engine
     deposit_eligibility = resolve_deposit_eligibility(
@@ -163,48 +246,37 @@ def extract_behavioural_features(
 
     # Nedbank ATM withdrawal count (from atm_owner column)
     if "atm_owner" in tx.columns:
-        nedbank_atm_count = int(
-            ((tx["type"] == "atm_withdrawal") & (tx["atm_owner"] == "nedbank")).sum()
+        nedbank_atm_count = np.count_nonzero(
+            (type_arr == "atm_withdrawal") & (tx["atm_owner"].to_numpy() == "nedbank")
         )
     else:
         nedbank_atm_count = 0
 
     # Retail CashOut count — v0.3.1: also include pos_purchase where merchant=="retail_cashout"
-    cashout_type_mask = tx["type"] == "cashout"
+    # The two clauses select disjoint types, so the union count is a sum
+    cashout_count = count_types(("cashout",))
     if "merchant" in tx.columns:
-        pos_cashout_mask = (tx["type"] == "pos_purchase") & (tx["merchant"] == "retail_cashout")
-        cashout_count = int((cashout_type_mask | pos_cashout_mask).sum())
-    else:
-        cashout_count = int(cashout_type_mask.sum())
+        pos_cashout_mask = (type_arr == "pos_purchase") & (tx["merchant"].to_numpy() == "retail_cashout")
+        cashout_count += np.count_nonzero(pos_cashout_mask)
 
     # Digital transaction count (raw count, not ratio)
     digital_txn_count = digital_count
 
     # Total payments (non-income, non-cash_deposit)
-    total_payments = int(tx["type"].isin(PAYMENT_TYPES).sum())
+    total_payments = count_types(PAYMENT_TYPES)
 
     # POS purchase count
-    pos_purchase_count = int((tx["type"] == "pos_purchase").sum())
+    pos_purchase_count = count_types(("pos_purchase",))
 
     # Charged transaction count — derive from tariff engine (real fees, no approximation)
-    if fee_schedule is not None and txn_count > 0:
-        # Build a single-customer DataFrame slice and use compute_variable_fees
-        # We need a customer_id column; use a sentinel if it was sliced already
-        if "customer_id" not in tx.columns or tx["customer_id"].nunique() != 1:
-            tx_for_fee = tx.copy()
-            tx_for_fee["customer_id"] = "__feature_eval__"
-            sentinel_id = "__feature_eval__"
-        else:
-            tx_for_fee = tx
-            sentinel_id = tx["customer_id"].iloc[0]
-
-        fee_results = compute_variable_fees(tx_for_fee, fee_schedule, account_class)
-        by_type = fee_results.get(sentinel_id, {}).get("by_type", {})
-        # Count transactions per charged type
-        charged_txn_count = 0
-        for txn_type, total_fee in by_type.items():
-            if total_fee > 0:
-                charged_txn_count += int((tx["type"] == txn_type).sum())
+    if fee_schedule is not None:
+        # Per-row fees straight from the vectorized rule evaluation; only
+        # which types were charged matters here, so the per-customer
+        # breakdown compute_variable_fees aggregates is not needed
+        fees = compute_transaction_fees(tx, fee_schedule, account_class)
+        charged_types = set(type_arr[fees > 0].tolist())
+        # Every transaction of a charged type counts (lookups in the type tally)
+        charged_txn_count = count_types(charged_types)
     else:
         charged_txn_count = 0
 
@@ -213,38 +285,103 @@ def extract_behavioural_features(
     # -------------------------------------------------------------------------
 
     # online_subscription_used: 1 if any txn channel in {online, app, ussd}
+    # (to_numpy() still materializes the whole column; only the membership
+    # pass, isdisjoint walking it in C, stops at the first digital channel)
     if "channel" in tx.columns:
-        online_subscription_used = int(tx["channel"].isin(_DIGITAL_CHANNELS).any())
+        online_subscription_used = not _DIGITAL_CHANNELS.isdisjoint(tx["channel"].to_numpy())
     else:
         online_subscription_used = 0
 
     # EFT sub-type counts
-    eft_to_nedbank_count = int((tx["type"] == "eft_transfer_internal").sum())
-    eft_to_otherbank_count = int((tx["type"] == "eft_transfer_external").sum())
+    eft_to_nedbank_count = count_types(("eft_transfer_internal",))
+    eft_to_otherbank_count = count_types(("eft_transfer_external",))
 
+    # numpy scalars from the masked reductions become Python numbers only here
     return {
         # --- v0.2.1 keys (unchanged) ---
-        "txn_count": int(txn_count),
+        "txn_count": txn_count,
         "total_inflow": float(abs(inflow)),   # Make positive for display
         "total_outflow": float(outflow),
         "atm_withdrawal_count": atm_count,
         "cash_deposit_count": cash_deposit_count,          # v0.2.1
-        "utility_count": int(utility_count),
-        "third_party_payment_count": int(third_party_count),
-        "digital_ratio": float(round(digital_ratio, 4)),
+        "utility_count": utility_count,
+        "third_party_payment_count": third_party_count,
+        "digital_ratio": round(digital_ratio, 4),
         "behaviour_tag": tag,
         "deposit_fee_eligibility_status": deposit_eligibility,  # v0.2.1
 
         # --- v0.3.0 keys (all default 0 — backward-compatible) ---
-        "nedbank_atm_withdrawal_count": nedbank_atm_count,
-        "cashout_count": cashout_count,                    # v0.3.1: extended OR clause
+        "nedbank_atm_withdrawal_count": int(nedbank_atm_count),
+        "cashout_count": int(cashout_count),               # v0.3.1: extended OR clause
         "digital_txn_count": digital_txn_count,
         "total_payments": total_payments,
         "pos_purchase_count": pos_purchase_count,
         "charged_txn_count": charged_txn_count,
 
         # --- v0.3.1 keys (all default 0 — backward-compatible) ---
-        "online_subscription_used": online_subscription_used,
+        "online_subscription_used": int(online_subscription_used),
         "eft_to_nedbank_count": eft_to_nedbank_count,
         "eft_to_otherbank_count": eft_to_otherbank_count,
     }
+
+
+def extract_behavioural_features_batch(transactions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute the v0.2.1 behavioural feature keys for every customer in one pass.
+
+    Equivalent to calling extract_behavioural_features() per customer and keeping
+    the v0.2.1 keys, but done as a single groupby aggregation over indicator
+    columns instead of one DataFrame slice per customer.
+
+    Args:
+        transactions: DataFrame with customer_id, type and amount columns
+
+    Returns:
+        DataFrame indexed by customer_id (first-seen order) with columns:
+        txn_count, total_inflow, total_outflow, atm_withdrawal_count,
+        cash_deposit_count, utility_count, third_party_payment_count,
+        digital_ratio, behaviour_tag
+
+    Example:
+        >>> transactions = pd.read_csv('data/synthetic/transactions_sample.csv')
+        >>> features = extract_behavioural_features_batch(transactions)
+        >>> print(features.loc['CUST_001', 'behaviour_tag'])
+    """
+    tx_type = transactions["type"]
+    amount = transactions["amount"]
+    is_inflow = tx_type.isin(INFLOW_TYPES)
+
+    indicators = pd.DataFrame({
+        "customer_id": transactions["customer_id"],
+        "inflow": amount.where(is_inflow, 0.0),
+        "outflow": amount.where(~is_inflow, 0.0),
+        "atm": tx_type.eq("atm_withdrawal"),
+        "cash_deposit": tx_type.eq("cash_deposit"),
+        "utility": tx_type.isin(_UTILITY_TYPES),
+        "third_party": tx_type.eq("third_party_payment"),
+        "digital": tx_type.isin(DIGITAL_TYPES),
+    })
+    agg = indicators.groupby("customer_id", sort=False, observed=True).agg(
+        txn_count=("atm", "size"),
+        total_inflow=("inflow", "sum"),
+        total_outflow=("outflow", "sum"),
+        atm_withdrawal_count=("atm", "sum"),
+        cash_deposit_count=("cash_deposit", "sum"),
+        utility_count=("utility", "sum"),
+        third_party_payment_count=("third_party", "sum"),
+        digital_count=("digital", "sum"),
+    )
+
+    # Groups are never empty, so txn_count >= 1 here
+    digital_ratio = agg["digital_count"] / agg["txn_count"]
+    agg["total_inflow"] = agg["total_inflow"].abs()   # Make positive for display
+    agg["behaviour_tag"] = _behaviour_tags(
+        agg["txn_count"], agg["atm_withdrawal_count"], digital_ratio, agg["utility_count"],
+    )
+    agg["digital_ratio"] = digital_ratio.round(4)
+
+    return agg[[
+        "txn_count", "total_inflow", "total_outflow", "atm_withdrawal_count",
+        "cash_deposit_count", "utility_count", "third_party_payment_count",
+        "digital_ratio", "behaviour_tag",
+    ]]
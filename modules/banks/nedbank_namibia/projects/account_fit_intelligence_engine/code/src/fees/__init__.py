@@ -0,0 +1 @@
+"""Tariff engine and account fee models."""
@@ -31,9 +31,8 @@ def calculate_monthly_fee(account_config: Dict[str, Any], transactions) -> Dict[
             - notes: Important limitations and assumptions
             
     Example:
-        >>> import yaml
-        >>> with open('configs/account_types/silver_payu.yaml', 'r') as f:
-        ...     config = yaml.safe_load(f)
+        >>> from config import load_account_config
+        >>> config = load_account_config('configs/account_types/silver_payu.yaml')
         >>> transactions = pd.read_csv('data/synthetic/transactions_sample.csv')
         >>> fees = calculate_monthly_fee(config, transactions)
         >>> print(f"Total monthly estimate: {fees['total_estimated_fee']} NAD")
@@ -7,7 +7,8 @@ multiple fee rule types: flat, per_step, and base_plus_step_cap.
 
 import math
 from typing import Any, Dict, Optional, Tuple
-import yaml
+from config import load_yaml_config
+import numpy as np
 import pandas as pd
 
 
@@ -111,8 +112,87 @@ def load_fee_schedule(fee_schedule_path: str) -> Dict[str, Any]:
     Returns:
         Fee schedule dictionary
     """
-    with open(fee_schedule_path, 'r') as f:
-        return yaml.safe_load(f)
+    return load_yaml_config(fee_schedule_path)
+
+
+def compute_transaction_fees(
+    transactions_df: pd.DataFrame,
+    fee_schedule: Dict[str, Any],
+    account_class: str
+) -> np.ndarray:
+    """
+    Compute the variable fee charged on each transaction, vectorized.
+
+    Applies the same rules as the per-transaction helpers above (income is
+    never charged; online flat fees; Nedbank per_step and other-bank
+    base_plus_step_cap ATM fees; local POS flat fee by account class), but
+    evaluates each rule once over all matching rows.
+
+    Args:
+        transactions_df: DataFrame with columns: type, amount, and optionally
+                         channel, atm_owner (default 'nedbank'), pos_scope
+                         (default 'local')
+        fee_schedule: Fee schedule dictionary from YAML
+        account_class: Account classification ("current" or "savings") for POS fees
+
+    Returns:
+        float64 array of per-transaction fees aligned with transactions_df rows
+
+    Example:
+        >>> fees = compute_transaction_fees(transactions, fee_schedule, "current")
+        >>> charged = transactions[fees > 0]
+    """
+    n = len(transactions_df)
+    fees = np.zeros(n, dtype=np.float64)
+    if n == 0:
+        return fees
+
+    def column(name: str, default: str) -> pd.Series:
+        if name in transactions_df.columns:
+            return transactions_df[name]
+        return pd.Series(default, index=transactions_df.index, dtype=object)
+
+    tx_type = transactions_df['type']
+    channel = column('channel', '')
+    amount = transactions_df['amount'].abs().to_numpy(dtype=np.float64)
+    chargeable = tx_type.ne('income').to_numpy()
+
+    # Online channel transactions
+    online = chargeable & channel.eq('online').to_numpy()
+    if online.any():
+        for online_type, rule in fee_schedule.get('online', {}).items():
+            if rule['rule_type'] == 'flat':
+                fees[online & tx_type.eq(online_type).to_numpy()] = fee_flat(rule['value'])
+
+    # ATM channel transactions
+    atm = chargeable & channel.eq('atm').to_numpy() & tx_type.eq('atm_withdrawal').to_numpy()
+    if atm.any():
+        atm_owner = column('atm_owner', 'nedbank')
+
+        rule = fee_schedule['atm'].get('nedbank_atm_withdrawal', {})
+        mask = atm & atm_owner.eq('nedbank').to_numpy()
+        if rule.get('rule_type') == 'per_step' and mask.any():
+            fees[mask] = np.ceil(amount[mask] / rule['step_amount']) * rule['step_fee']
+
+        rule = fee_schedule['atm'].get('other_bank_atm_withdrawal', {})
+        mask = atm & atm_owner.eq('other_bank').to_numpy()
+        if rule.get('rule_type') == 'base_plus_step_cap' and mask.any():
+            steps = np.ceil(amount[mask] / rule['step_amount'])
+            fees[mask] = np.minimum(
+                rule['base_fee'] + steps * rule['step_fee'], rule['cap']
+            )
+
+    # POS channel transactions
+    pos = chargeable & channel.eq('pos').to_numpy() & tx_type.eq('pos_purchase').to_numpy()
+    if pos.any():
+        local_rules = fee_schedule['pos'].get('local', {})
+        if account_class in local_rules:
+            rule = local_rules[account_class]
+            if rule['rule_type'] == 'flat':
+                mask = pos & column('pos_scope', 'local').eq('local').to_numpy()
+                fees[mask] = fee_flat(rule['value'])
+
+    return fees
 
 
 def compute_variable_fees(
@@ -144,79 +224,35 @@ def compute_variable_fees(
         >>> fees = compute_variable_fees(transactions, fee_schedule, "current")
         >>> print(fees['CUST_001']['variable_total'])
     """
-    results = {}
-    
-    # Group by customer
-    for customer_id in transactions_df['customer_id'].unique():
-        customer_txns = transactions_df[transactions_df['customer_id'] == customer_id]
-        
-        by_type = {}
-        by_channel = {}
-        total = 0.0
-        
-        for _, txn in customer_txns.iterrows():
-            fee = 0.0
-            tx_type = txn['type']
-            channel = txn.get('channel', '')
-            amount = abs(txn['amount'])
-            
-            # Skip income transactions (no fee)
-            if tx_type == 'income':
-                continue
-            
-            # Online channel transactions
-            if channel == 'online':
-                if tx_type in fee_schedule.get('online', {}):
-                    rule = fee_schedule['online'][tx_type]
-                    if rule['rule_type'] == 'flat':
-                        fee = fee_flat(rule['value'])
-            
-            # ATM channel transactions
-            elif channel == 'atm' and tx_type == 'atm_withdrawal':
-                atm_owner = txn.get('atm_owner', 'nedbank')
-                
-                if atm_owner == 'nedbank':
-                    rule = fee_schedule['atm'].get('nedbank_atm_withdrawal', {})
-                    if rule.get('rule_type') == 'per_step':
-                        fee = fee_per_step(
-                            amount,
-                            rule['step_amount'],
-                            rule['step_fee']
-                        )
-                elif atm_owner == 'other_bank':
-                    rule = fee_schedule['atm'].get('other_bank_atm_withdrawal', {})
-                    if rule.get('rule_type') == 'base_plus_step_cap':
-                        fee = fee_base_plus_step_cap(
-                            amount,
-                            rule['base_fee'],
-                            rule['step_amount'],
-                            rule['step_fee'],
-                            rule['cap']
-                        )
-            
-            # POS channel transactions
-            elif channel == 'pos' and tx_type == 'pos_purchase':
-                pos_scope = txn.get('pos_scope', 'local')
-                
-                if pos_scope == 'local':
-                    local_rules = fee_schedule['pos'].get('local', {})
-                    if account_class in local_rules:
-                        rule = local_rules[account_class]
-                        if rule['rule_type'] == 'flat':
-                            fee = fee_flat(rule['value'])
-            
-            # Accumulate fees
-            if fee > 0:
-                total += fee
-                by_type[tx_type] = by_type.get(tx_type, 0.0) + fee
-                by_channel[channel] = by_channel.get(channel, 0.0) + fee
-        
-        results[customer_id] = {
-            'variable_total': round(total, 2),
-            'by_type': {k: round(v, 2) for k, v in by_type.items()},
-            'by_channel': {k: round(v, 2) for k, v in by_channel.items()}
-        }
-    
+    customer_ids = transactions_df['customer_id']
+
+    # Every customer gets an entry, in first-seen order, even with no fees
+    results = {
+        customer_id: {'variable_total': 0.0, 'by_type': {}, 'by_channel': {}}
+        for customer_id in customer_ids.unique().tolist()
+    }
+
+    fees = compute_transaction_fees(transactions_df, fee_schedule, account_class)
+    charged = fees > 0
+    if not charged.any():
+        return results
+
+    # Only charged rows are accumulated; sort=False keeps each customer's
+    # types/channels in the order their first fee was charged
+    charged_df = pd.DataFrame({
+        'customer_id': customer_ids.to_numpy(dtype=object)[charged],
+        'type': transactions_df['type'].to_numpy(dtype=object)[charged],
+        'channel': transactions_df['channel'].to_numpy(dtype=object)[charged],
+        'fee': fees[charged],
+    })
+    totals = charged_df.groupby('customer_id', sort=False)['fee'].sum()
+    for customer_id, total in zip(totals.index.tolist(), totals.tolist()):
+        results[customer_id]['variable_total'] = round(total, 2)
+    for key in ('type', 'channel'):
+        sums = charged_df.groupby(['customer_id', key], sort=False)['fee'].sum()
+        for (customer_id, name), value in zip(sums.index.tolist(), sums.tolist()):
+            results[customer_id]['by_' + key][name] = round(value, 2)
+
     return results
 
 
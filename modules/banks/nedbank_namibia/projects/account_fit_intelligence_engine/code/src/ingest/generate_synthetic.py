@@ -28,8 +28,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Make code/src importable when run as a script. Skipped when already on the
+# path (e.g. `python -m ingest.generate_synthetic` from code/src, or a second import).
+_SRC_DIR = str(Path(__file__).resolve().parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 from utils.paths import find_project_root
 
 # Deterministic seed for reproducibility
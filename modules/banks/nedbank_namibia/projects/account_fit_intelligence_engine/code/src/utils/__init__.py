@@ -0,0 +1 @@
+"""Shared utilities (project root resolution)."""
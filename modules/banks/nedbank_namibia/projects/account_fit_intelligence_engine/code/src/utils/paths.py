@@ -9,9 +9,11 @@ Root markers (checked in priority order):
   2. configs/ + data/ dirs        — fallback for legacy compatibility
 """
 
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def find_project_root(start: Path | None = None) -> Path:
     """
     Find the project root by walking upward from start directory.
@@ -20,6 +22,9 @@ def find_project_root(start: Path | None = None) -> Path:
       1. A ``.project_root`` sentinel file (placed at repo root by convention).
       2. A directory containing both ``configs/`` and ``data/`` subdirectories.
 
+    Results are memoized per start path, so repeated lookups within a
+    process skip the upward filesystem walk.
+
     Args:
         start: Starting directory for search. If None, uses this file's location.
 
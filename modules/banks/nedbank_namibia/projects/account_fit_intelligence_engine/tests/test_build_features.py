@@ -0,0 +1,66 @@
+"""
+The batch feature extractor must agree with the per-customer extractor.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "code" / "src"))
+
+from features.build_features import (  # noqa: E402
+    extract_behavioural_features,
+    extract_behavioural_features_batch,
+)
+from ingest.load_data import load_transactions  # noqa: E402
+
+# Batch sums run in groupby order, per-customer sums in np.nansum order
+FLOW_KEYS = ("total_inflow", "total_outflow")
+
+
+def _edge_case_transactions():
+    """Single-transaction, no-ATM and NaN-amount customers."""
+    rows = [
+        # customer_id, type, amount, channel
+        ("SINGLE", "eft_transfer", 1500.0, "online"),
+        ("NO_ATM", "income", -12000.0, ""),
+        ("NO_ATM", "electricity_purchase", 250.0, "online"),
+        ("NO_ATM", "airtime_purchase", 30.0, "online"),
+        ("NO_ATM", "third_party_payment", 900.0, "online"),
+        ("NAN_AMOUNTS", "income", np.nan, ""),
+        ("NAN_AMOUNTS", "income", -8000.0, ""),
+        ("NAN_AMOUNTS", "atm_withdrawal", np.nan, "atm"),
+        ("NAN_AMOUNTS", "atm_withdrawal", 600.0, "atm"),
+        ("NAN_AMOUNTS", "cash_deposit", 2000.0, "branch"),
+        ("NAN_AMOUNTS", "pos_purchase", np.nan, "pos"),
+        ("ALL_NAN", "atm_withdrawal", np.nan, "atm"),
+        ("ALL_NAN", "income", np.nan, ""),
+    ]
+    return pd.DataFrame(rows, columns=["customer_id", "type", "amount", "channel"])
+
+
+@pytest.mark.parametrize("source", ["edge_cases", "sample"])
+def test_batch_matches_per_customer_features(source):
+    """Each batch row equals extract_behavioural_features() for that customer."""
+    if source == "edge_cases":
+        transactions = _edge_case_transactions()
+    else:
+        transactions = load_transactions(
+            str(PROJECT_ROOT / "data" / "synthetic" / "transactions_sample.csv")
+        )
+    batch = extract_behavioural_features_batch(transactions)
+    groups = transactions.groupby("customer_id", sort=False, observed=True)
+
+    assert batch.index.tolist() == list(groups.groups)
+    for customer_id, customer_txns in groups:
+        expected = extract_behavioural_features(customer_txns)
+        row = batch.loc[customer_id]
+        for key in batch.columns:
+            if key in FLOW_KEYS:
+                assert row[key] == pytest.approx(expected[key], rel=1e-12, abs=1e-9), \
+                    (customer_id, key)
+            else:
+                assert row[key] == expected[key], (customer_id, key)
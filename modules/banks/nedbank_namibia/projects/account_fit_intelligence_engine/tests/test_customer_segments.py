@@ -0,0 +1,99 @@
+"""
+Customer segment normalisation must agree across engine modes.
+
+A blank customer_segment is treated as 'individual', so the customer is
+exempt from the SME cash deposit fee in every mode. CUST_006 (sme, turnover
+above threshold, 2 cash deposits) pays N$50.00 in deposit fees when its
+segment is present and nothing when it is blank.
+"""
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "code" / "src"))
+
+from engine.account_fit import build_customer_map, load_customers  # noqa: E402
+from engine.portfolio_engine import run_portfolio  # noqa: E402
+from fees.tariff_engine import resolve_deposit_eligibility  # noqa: E402
+from ingest.load_data import load_transactions  # noqa: E402
+
+DATA_DIR = PROJECT_ROOT / "data" / "synthetic"
+BLANK_CUSTOMER = "CUST_006"
+# Silver PAYU total for CUST_006 without the N$50.00 deposit fee
+BLANK_CUSTOMER_PAYU_TOTAL = 572.30
+
+
+def _project_copy_with_blank_segment(tmp_path: Path) -> Path:
+    """Copy code/configs/data to tmp_path with BLANK_CUSTOMER's segment blanked."""
+    for name in ("code", "configs", "data"):
+        shutil.copytree(
+            PROJECT_ROOT / name, tmp_path / name,
+            ignore=shutil.ignore_patterns("__pycache__"),
+        )
+    customers_csv = tmp_path / "data" / "synthetic" / "customers_sample.csv"
+    lines = customers_csv.read_text().splitlines()
+    header = lines[0].split(",")
+    seg_col = header.index("customer_segment")
+    for i, line in enumerate(lines[1:], start=1):
+        fields = line.split(",")
+        if fields[0] == BLANK_CUSTOMER:
+            fields[seg_col] = ""
+            lines[i] = ",".join(fields)
+    customers_csv.write_text("\n".join(lines) + "\n")
+    return tmp_path
+
+
+def _customer_block(report: str, customer_id: str) -> list:
+    """Return the lines of one customer's block in a single-mode report."""
+    lines = report.splitlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith(customer_id))
+    end = next(
+        (i for i in range(start + 1, len(lines)) if not lines[i].strip()), len(lines)
+    )
+    return lines[start:end]
+
+
+def test_blank_segment_matches_in_single_and_portfolio_mode():
+    """A blank segment is 'individual' in both single and portfolio mode."""
+    customers = load_customers(str(DATA_DIR / "customers_sample.csv"))
+    customers.loc[customers["customer_id"] == BLANK_CUSTOMER, "customer_segment"] = np.nan
+    transactions = load_transactions(str(DATA_DIR / "transactions_sample.csv"))
+    customer_txns = transactions[transactions["customer_id"] == BLANK_CUSTOMER]
+
+    # Single mode: segment and turnover from build_customer_map
+    segments, turnovers = build_customer_map(customers, [BLANK_CUSTOMER])
+    single_status = resolve_deposit_eligibility(segments[0], turnovers[0], 1_300_000)
+
+    # Portfolio mode: per-account results from run_portfolio
+    portfolio = run_portfolio(
+        ["basic_banking", "silver_payu"], customer_txns, customers, PROJECT_ROOT
+    )
+    accounts = portfolio["customers"][BLANK_CUSTOMER]["accounts"]
+
+    assert segments[0] == "individual"
+    assert single_status == "individual"
+    for result in accounts.values():
+        assert result["deposit_fee_eligibility_status"] == single_status
+    assert accounts["silver_payu"]["total_cost"] == BLANK_CUSTOMER_PAYU_TOTAL
+    assert "cash_deposit" not in dict(accounts["silver_payu"]["top_fee_drivers"])
+
+
+def test_blank_segment_single_mode_charges_no_deposit_fee(tmp_path):
+    """Single-mode report bills a blank-segment customer as an individual."""
+    project = _project_copy_with_blank_segment(tmp_path)
+    result = subprocess.run(
+        [sys.executable, str(project / "code" / "src" / "engine" / "account_fit.py"),
+         "--account", "silver_payu"],
+        capture_output=True, text=True, check=True, cwd=str(project),
+    )
+    block = _customer_block(result.stdout, BLANK_CUSTOMER)
+
+    assert "[IND]" in block[0]
+    assert f"Total: N${BLANK_CUSTOMER_PAYU_TOTAL:.2f}" in block[2]
+    deposit_line = next(line for line in block if "Deposit:" in line)
+    assert "individual" in deposit_line and "FREE" in deposit_line
+    assert not any("cash_deposit N$" in line for line in block)
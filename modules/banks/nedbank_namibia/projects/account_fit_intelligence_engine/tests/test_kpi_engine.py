@@ -0,0 +1,129 @@
+"""
+SafeExpressionEvaluator must behave like a validated, builtins-free eval().
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "code" / "src"))
+
+from engine import account_fit  # noqa: E402
+from engine.kpi_engine import KPIEngine, SafeExpressionEvaluator  # noqa: E402
+from features.build_features import extract_behavioural_features  # noqa: E402
+
+
+def _plain_eval(formula, namespace):
+    return eval(formula, {"__builtins__": {}}, {"max": max, "min": min, **namespace})  # noqa: S307
+
+
+def _outcome(evaluate, formula, namespace):
+    """Result of evaluate(formula, namespace), or the exception type it raised."""
+    try:
+        return evaluate(formula, namespace)
+    except Exception as exc:
+        return type(exc)
+
+
+def _kpi_configs():
+    """KPI configs of every account type that has one."""
+    for path in sorted((PROJECT_ROOT / "configs" / "account_types").glob("*.yaml")):
+        account_config = account_fit.load_account_config(str(path))
+        kpi_config = account_fit.load_kpi_config_for_account(account_config, PROJECT_ROOT)
+        if kpi_config is not None:
+            yield kpi_config
+
+
+def test_config_formulas_match_plain_eval():
+    """Every KPI and joined signal formula gives the same outcome as eval()."""
+    fee_schedule = account_fit.load_fee_schedule(
+        str(PROJECT_ROOT / "configs" / "fee_schedules" / "nedbank_2026_27.yaml")
+    )
+    transactions = account_fit.load_transactions(
+        str(PROJECT_ROOT / "data" / "synthetic" / "transactions_sample.csv")
+    )
+    evaluator = SafeExpressionEvaluator()
+    checked = 0
+    for kpi_config in _kpi_configs():
+        engine = KPIEngine(kpi_config)
+        for _, customer_txns in transactions.groupby("customer_id", sort=False, observed=True):
+            features = extract_behavioural_features(customer_txns, fee_schedule=fee_schedule)
+            namespace = {**features, **kpi_config.get("free_tier", {})}
+            for kpi_def in kpi_config["kpis"].values():
+                formula = kpi_def.get("formula")
+                if formula:
+                    assert evaluator.evaluate(formula, namespace) == \
+                        _plain_eval(formula, namespace), formula
+                    checked += 1
+
+            kpis = engine.compute_kpis(features)
+            kpis["excess_atm_cost"] = engine.compute_excess_atm_cost(
+                features, customer_txns, fee_schedule
+            )
+            kpi_namespace = {k: v for k, v in kpis.items() if v is not None}
+            for formula in engine._signal_formulas.values():
+                # Signals see only KPIs, so some raise NameError; both must agree
+                assert _outcome(evaluator.evaluate, formula, kpi_namespace) == \
+                    _outcome(_plain_eval, formula, kpi_namespace), formula
+                checked += 1
+    assert checked > 0
+
+
+def test_unknown_name_raises_name_error():
+    """A name missing from the namespace raises NameError, not KeyError."""
+    evaluator = SafeExpressionEvaluator()
+    formula = "txn_count / max(not_a_feature, 1)"
+
+    with pytest.raises(NameError, match="not_a_feature"):
+        evaluator.evaluate(formula, {"txn_count": 3})
+    # The compiled path still works once every name is present
+    assert evaluator.evaluate(formula, {"txn_count": 3, "not_a_feature": 2}) == 1.5
+
+
+def test_joined_signal_conditions_short_circuit():
+    """'(c1) and (c2)' stops at the first false condition, like the per-condition loop."""
+    engine = KPIEngine({"migration_signals": {
+        "joined": {"all": ["ratio > 0", "1 / divisor > 0", "missing_kpi > 0"]},
+    }})
+    formula = engine._signal_formulas["joined"]
+    evaluator = SafeExpressionEvaluator()
+
+    assert formula == "(ratio > 0) and (1 / divisor > 0) and (missing_kpi > 0)"
+    # c1 is False: neither the division by zero nor the missing name is reached
+    assert evaluator.evaluate(formula, {"ratio": 0, "divisor": 0}) is False
+    # c1 is True: c2 runs and divides by zero
+    with pytest.raises(ZeroDivisionError):
+        evaluator.evaluate(formula, {"ratio": 1, "divisor": 0})
+    # c1 and c2 are True: c3 is reached and its name is missing
+    with pytest.raises(NameError):
+        evaluator.evaluate(formula, {"ratio": 1, "divisor": 1})
+    assert engine.evaluate_migration_signals({"ratio": 0, "divisor": 0}) == []
+    assert engine.evaluate_migration_signals(
+        {"ratio": 1, "divisor": 1, "missing_kpi": 1}
+    ) == ["joined"]
+
+
+@pytest.mark.parametrize("formula", [
+    "features.__class__",                # Attribute
+    "txn_count.__class__.__bases__",     # Attribute chain
+    "counts[0]",                         # Subscript
+    "lambda: 1",                         # Lambda
+    "[x for x in counts]",               # ListComp
+    "(x := 1)",                          # NamedExpr
+    "f'{txn_count}'",                    # JoinedStr
+    "(txn_count, 1)",                    # Tuple
+    "txn_count if txn_count else 1",     # IfExp
+    "__import__('os')",                  # Call to a non-allowed name
+    "abs(txn_count)",                    # Call to a non-allowed builtin
+    "max(*counts)",                      # Starred
+    "max(txn_count, key=abs)",           # keyword arguments
+    "max.__call__(1, 2)",                # Call on an attribute
+])
+def test_disallowed_nodes_are_rejected(formula):
+    """The validator rejects anything outside the safe node allow-list."""
+    evaluator = SafeExpressionEvaluator()
+
+    with pytest.raises(ValueError):
+        evaluator.evaluate(formula, {"txn_count": 1, "counts": [1], "features": {}})
+    assert formula not in SafeExpressionEvaluator._cache
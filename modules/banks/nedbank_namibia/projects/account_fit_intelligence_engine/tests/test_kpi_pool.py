@@ -0,0 +1,56 @@
+"""
+The process-pool KPI path must reproduce the serial path exactly.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "code" / "src"))
+
+from engine import account_fit  # noqa: E402
+
+
+class _CountingPool(account_fit.ProcessPoolExecutor):
+    """ProcessPoolExecutor that records how many pools were started."""
+
+    started = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).started += 1
+        super().__init__(*args, **kwargs)
+
+
+def test_pool_results_match_serial(monkeypatch):
+    """compute_kpi_results gives the same output with max_workers=2 as serially."""
+    fee_schedule = account_fit.load_fee_schedule(
+        str(PROJECT_ROOT / "configs" / "fee_schedules" / "nedbank_2026_27.yaml")
+    )
+    account_config = account_fit.load_account_config(
+        str(PROJECT_ROOT / "configs" / "account_types" / "basic_banking.yaml")
+    )
+    kpi_config = account_fit.load_kpi_config_for_account(account_config, PROJECT_ROOT)
+    transactions = account_fit.load_transactions(
+        str(PROJECT_ROOT / "data" / "synthetic" / "transactions_sample.csv")
+    )
+    customers = account_fit.load_customers(
+        str(PROJECT_ROOT / "data" / "synthetic" / "customers_sample.csv")
+    )
+    codes, customer_ids = pd.factorize(transactions["customer_id"], sort=False)
+    segments, turnovers = account_fit.build_customer_map(customers, customer_ids)
+    tx_slices = [tx for _, tx in transactions.groupby(codes, sort=False)]
+    args = (
+        tx_slices, segments, turnovers, kpi_config, 1_300_000, fee_schedule,
+        account_config["account_class"], account_config,
+    )
+
+    serial = account_fit.compute_kpi_results(*args, max_workers=1)
+    # Lower the threshold so the 20-customer sample takes the pool path
+    monkeypatch.setattr(account_fit, "_PARALLEL_MIN_CUSTOMERS", 1)
+    monkeypatch.setattr(account_fit, "ProcessPoolExecutor", _CountingPool)
+    pooled = account_fit.compute_kpi_results(*args, max_workers=2)
+
+    assert _CountingPool.started == 1
+    assert len(pooled) == len(tx_slices)
+    assert pooled == serial
@@ -0,0 +1,216 @@
+"""
+The vectorized tariff engine must charge what the per-transaction rules charge.
+
+_reference_fee() and _reference_variable_fees() reproduce the per-row loop
+compute_variable_fees() used before compute_transaction_fees() existed.
+"""
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "code" / "src"))
+
+from features.build_features import extract_behavioural_features  # noqa: E402
+from fees.tariff_engine import (  # noqa: E402
+    compute_transaction_fees,
+    compute_variable_fees,
+    fee_base_plus_step_cap,
+    fee_flat,
+    fee_per_step,
+    load_fee_schedule,
+)
+from ingest.load_data import load_transactions  # noqa: E402
+
+FEE_SCHEDULE = load_fee_schedule(
+    str(PROJECT_ROOT / "configs" / "fee_schedules" / "nedbank_2026_27.yaml")
+)
+
+
+def _reference_fee(txn, fee_schedule, account_class):
+    """Fee for one transaction row, as the per-row loop computed it."""
+    tx_type = txn['type']
+    channel = txn.get('channel', '')
+    amount = abs(txn['amount'])
+
+    if tx_type == 'income':
+        return 0.0
+    if channel == 'online':
+        rule = fee_schedule.get('online', {}).get(tx_type)
+        if rule and rule['rule_type'] == 'flat':
+            return fee_flat(rule['value'])
+    elif channel == 'atm' and tx_type == 'atm_withdrawal':
+        atm_owner = txn.get('atm_owner', 'nedbank')
+        if atm_owner == 'nedbank':
+            rule = fee_schedule['atm'].get('nedbank_atm_withdrawal', {})
+            if rule.get('rule_type') == 'per_step':
+                return fee_per_step(amount, rule['step_amount'], rule['step_fee'])
+        elif atm_owner == 'other_bank':
+            rule = fee_schedule['atm'].get('other_bank_atm_withdrawal', {})
+            if rule.get('rule_type') == 'base_plus_step_cap':
+                return fee_base_plus_step_cap(
+                    amount, rule['base_fee'], rule['step_amount'],
+                    rule['step_fee'], rule['cap'],
+                )
+    elif channel == 'pos' and tx_type == 'pos_purchase':
+        if txn.get('pos_scope', 'local') == 'local':
+            rule = fee_schedule['pos'].get('local', {}).get(account_class)
+            if rule and rule['rule_type'] == 'flat':
+                return fee_flat(rule['value'])
+    return 0.0
+
+
+def _reference_variable_fees(transactions_df, fee_schedule, account_class):
+    """compute_variable_fees() output, as the per-row loop built it."""
+    results = {}
+    for customer_id in transactions_df['customer_id'].unique():
+        customer_txns = transactions_df[transactions_df['customer_id'] == customer_id]
+        by_type, by_channel, total = {}, {}, 0.0
+        for _, txn in customer_txns.iterrows():
+            fee = _reference_fee(txn, fee_schedule, account_class)
+            if fee > 0:
+                channel = txn.get('channel', '')
+                total += fee
+                by_type[txn['type']] = by_type.get(txn['type'], 0.0) + fee
+                by_channel[channel] = by_channel.get(channel, 0.0) + fee
+        results[customer_id] = {
+            'variable_total': round(total, 2),
+            'by_type': {k: round(v, 2) for k, v in by_type.items()},
+            'by_channel': {k: round(v, 2) for k, v in by_channel.items()},
+        }
+    return results
+
+
+def _reference_fees(transactions_df, account_class):
+    return np.array([
+        _reference_fee(txn, FEE_SCHEDULE, account_class)
+        for _, txn in transactions_df.iterrows()
+    ], dtype=np.float64)
+
+
+def _mixed_transactions():
+    """Every fee rule, plus rows each rule must leave uncharged."""
+    rows = [
+        # customer_id, type, amount, channel, atm_owner, pos_scope
+        ("C1", "income", -5000.0, "online", None, None),
+        ("C1", "third_party_payment", 800.0, "online", None, None),
+        ("C1", "electricity_purchase", 100.0, "online", None, None),
+        ("C1", "airtime_purchase", 20.0, "online", None, None),
+        ("C1", "eft_transfer", 1200.0, "online", None, None),
+        ("C1", "pos_purchase", 60.0, "online", None, None),
+        ("C2", "atm_withdrawal", 300.0, "atm", "nedbank", None),
+        ("C2", "atm_withdrawal", 450.0, "atm", "nedbank", None),
+        ("C2", "atm_withdrawal", 400.0, "atm", "other_bank", None),
+        ("C2", "atm_withdrawal", 1000.0, "atm", "other_bank", None),
+        ("C2", "atm_withdrawal", 5000.0, "atm", "other_bank", None),  # capped
+        ("C2", "atm_withdrawal", 200.0, "atm", "unknown_owner", None),
+        ("C2", "atm_withdrawal", 200.0, "branch", "nedbank", None),
+        ("C3", "pos_purchase", 250.0, "pos", None, "local"),
+        ("C3", "pos_purchase", 250.0, "pos", None, "international"),
+        ("C3", "pos_purchase", -90.0, "pos", None, "local"),
+        ("C3", "third_party_payment", 300.0, "branch", None, None),
+    ]
+    return pd.DataFrame(
+        rows, columns=["customer_id", "type", "amount", "channel", "atm_owner", "pos_scope"]
+    )
+
+
+@pytest.mark.parametrize("account_class", ["current", "savings"])
+def test_transaction_fees_match_per_row_rules(account_class):
+    """Online, ATM (incl. other-bank cap) and POS scope rules match per-row fees."""
+    tx = _mixed_transactions()
+    fees = compute_transaction_fees(tx, FEE_SCHEDULE, account_class)
+
+    np.testing.assert_allclose(fees, _reference_fees(tx, account_class))
+    assert compute_variable_fees(tx, FEE_SCHEDULE, account_class) == \
+        _reference_variable_fees(tx, FEE_SCHEDULE, account_class)
+
+
+def test_other_bank_atm_fee_is_capped():
+    """Other-bank ATM fee stops at the cap however large the withdrawal."""
+    rule = FEE_SCHEDULE["atm"]["other_bank_atm_withdrawal"]
+    tx = pd.DataFrame({
+        "type": ["atm_withdrawal"] * 3,
+        "amount": [1000.0, 5000.0, 50000.0],
+        "channel": ["atm"] * 3,
+        "atm_owner": ["other_bank"] * 3,
+    })
+    fees = compute_transaction_fees(tx, FEE_SCHEDULE, "current")
+
+    assert fees[0] == pytest.approx(34.60)
+    assert fees[1:].tolist() == [rule["cap"], rule["cap"]]
+
+
+@pytest.mark.parametrize("missing", ["channel", "atm_owner", "pos_scope"])
+def test_missing_columns_use_per_row_defaults(missing):
+    """A missing channel/atm_owner/pos_scope column falls back like txn.get() did."""
+    tx = _mixed_transactions().drop(columns=[missing])
+    fees = compute_transaction_fees(tx, FEE_SCHEDULE, "current")
+
+    np.testing.assert_allclose(fees, _reference_fees(tx, "current"))
+    assert compute_variable_fees(tx, FEE_SCHEDULE, "current") == \
+        _reference_variable_fees(tx, FEE_SCHEDULE, "current")
+
+
+def test_nan_amounts():
+    """NaN amounts keep flat fees and are never charged a stepped ATM fee."""
+    tx = _mixed_transactions()
+    tx["amount"] = np.nan
+    fees = compute_transaction_fees(tx, FEE_SCHEDULE, "current")
+
+    # Flat-fee rules ignore the amount, so they still match per-row fees;
+    # the per-row ATM helpers raise on NaN (math.ceil), so rows are compared
+    # only where the reference is defined
+    atm = (tx["channel"] == "atm").to_numpy()
+    np.testing.assert_allclose(fees[~atm], _reference_fees(tx[~atm], "current"))
+    with pytest.raises(ValueError):
+        fee_per_step(math.nan, 300, 10.00)
+    assert not (fees[atm] > 0).any()
+
+    variable = compute_variable_fees(tx, FEE_SCHEDULE, "current")
+    assert variable == _reference_variable_fees(tx[~atm], FEE_SCHEDULE, "current") | {
+        "C2": {"variable_total": 0.0, "by_type": {}, "by_channel": {}}
+    }
+
+
+def test_empty_frame():
+    """No transactions: an empty fee array and no customers."""
+    tx = _mixed_transactions().iloc[0:0]
+
+    fees = compute_transaction_fees(tx, FEE_SCHEDULE, "current")
+    assert fees.dtype == np.float64 and fees.shape == (0,)
+    assert compute_variable_fees(tx, FEE_SCHEDULE, "current") == {}
+
+
+def test_sample_data_matches_per_row_rules():
+    """The categorical frames load_transactions() returns give per-row fees too."""
+    tx = load_transactions(str(PROJECT_ROOT / "data" / "synthetic" / "transactions_sample.csv"))
+    for account_class in ("current", "savings"):
+        fees = compute_transaction_fees(tx, FEE_SCHEDULE, account_class)
+        np.testing.assert_allclose(fees, _reference_fees(tx, account_class))
+        assert compute_variable_fees(tx, FEE_SCHEDULE, account_class) == \
+            _reference_variable_fees(tx, FEE_SCHEDULE, account_class)
+
+
+def test_charged_txn_count_counts_every_row_of_a_charged_type():
+    """charged_txn_count matches counting rows of each type the per-row loop charged."""
+    tx = pd.concat([
+        _mixed_transactions(),
+        load_transactions(
+            str(PROJECT_ROOT / "data" / "synthetic" / "transactions_sample.csv")
+        ).astype(object),
+    ], ignore_index=True)
+    for customer_id, customer_txns in tx.groupby("customer_id", sort=False):
+        by_type = _reference_variable_fees(
+            customer_txns, FEE_SCHEDULE, "current"
+        )[customer_id]["by_type"]
+        expected = int(customer_txns["type"].isin(
+            [t for t, fee in by_type.items() if fee > 0]
+        ).sum())
+
+        features = extract_behavioural_features(customer_txns, fee_schedule=FEE_SCHEDULE)
+        assert features["charged_txn_count"] == expected, customer_id